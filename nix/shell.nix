@@ -157,7 +157,10 @@ pkgs.mkShell {
       export DBUS_SESSION_BUS_ADDRESS="unix:path=/tmp/dbus/session_bus_socket"
       if ! pgrep -x "dbus-daemon" > /dev/null; then
         dbus-daemon --session --address="$DBUS_SESSION_BUS_ADDRESS" --nofork --nopidfile &
-        sleep 0.5
+        for i in $(seq 1 100); do
+          [ -S /tmp/dbus/session_bus_socket ] && break
+          sleep 0.05
+        done
       fi
     fi
 
@@ -170,12 +173,12 @@ pkgs.mkShell {
 
     # Wait for X11 socket to be ready
     echo "Waiting for X11 display..."
-    for i in $(seq 1 30); do
+    for i in $(seq 1 300); do
       if [ -e /tmp/.X11-unix/X99 ]; then
         echo "X11 display ready"
         break
       fi
-      sleep 0.5
+      sleep 0.05
     done
     if [ ! -e /tmp/.X11-unix/X99 ]; then
       echo "WARNING: X11 display not ready after 15s"
@@ -1,6 +1,9 @@
-use chromiumoxide::{Browser, BrowserConfig};
-use tokio::sync::OnceCell;
-use std::sync::Arc;
+use chromiumoxide::cdp::browser_protocol::page::{CaptureScreenshotFormat, CaptureScreenshotParams};
+use chromiumoxide::{Browser, BrowserConfig, Page};
+use tokio::sync::{OnceCell, OwnedSemaphorePermit, Semaphore};
+use std::future::Future;
+use std::sync::{Arc, Mutex};
+use std::time::Duration;
 use base64::{Engine as _, engine::general_purpose::STANDARD as BASE64};
 use futures::StreamExt;
 
@@ -12,8 +15,10 @@ pub struct BrowserServiceConfig {
     pub executable_path: Option<String>,
     pub viewport_width: u32,
     pub viewport_height: u32,
-    #[allow(dead_code)] // Reserved for future timeout support
+    /// Seconds screenshot and evaluate wait for a `wait_for` selector
     pub timeout: u64,
+    /// Maximum number of pages in use at once; further requests wait
+    pub max_pages: usize,
 }
 
 impl Default for BrowserServiceConfig {
@@ -24,13 +29,92 @@ impl Default for BrowserServiceConfig {
             viewport_width: 1280,
             viewport_height: 720,
             timeout: 30,
+            max_pages: 8,
         }
     }
 }
 
+/// Maximum number of idle pages kept open for reuse
+const MAX_IDLE_PAGES: usize = 4;
+
+/// Interval between checks while waiting for a selector to appear
+const WAIT_POLL_INTERVAL: Duration = Duration::from_millis(100);
+
+/// Chrome's DOM.querySelector error for a selector that does not parse. A
+/// valid selector with no match fails later, when resolving node id 0.
+const INVALID_SELECTOR_ERROR: &str = "DOM Error while querying";
+
+/// Poll until `selector` matches an element, so callers wait exactly as
+/// long as the page takes to render instead of sleeping a fixed time
+async fn wait_for_selector(
+    page: &Page,
+    selector: &str,
+    timeout: u64,
+) -> Result<(), BrowserError> {
+    let deadline = tokio::time::Instant::now() + Duration::from_secs(timeout);
+    loop {
+        match page.find_element(selector).await {
+            Ok(_) => return Ok(()),
+            // No amount of waiting makes an invalid selector match
+            Err(e) if e.to_string().contains(INVALID_SELECTOR_ERROR) => {
+                return Err(BrowserError::InvalidRequest(format!(
+                    "Invalid selector: {}",
+                    selector
+                )));
+            }
+            Err(_) => {}
+        }
+        if tokio::time::Instant::now() >= deadline {
+            return Err(BrowserError::Timeout(timeout));
+        }
+        tokio::time::sleep(WAIT_POLL_INTERVAL).await;
+    }
+}
+
+/// Reset a page to about:blank and keep it for reuse, or close it if the
+/// reset fails or the pool is full
+async fn release_page(pool: &Mutex<Vec<Page>>, page: Page) {
+    if page.goto("about:blank").await.is_ok() {
+        let mut pages = pool.lock().unwrap();
+        if pages.len() < MAX_IDLE_PAGES {
+            pages.push(page);
+            return;
+        }
+    }
+    page.close().await.ok();
+}
+
+/// A page checked out of the pool. Dropping it, whether the request finished
+/// or was cancelled by a client disconnect, releases the page in a background
+/// task, so the response never waits on the reset. The page slot is held
+/// until the release is done.
+struct PageLease {
+    page: Option<Page>,
+    pool: Arc<Mutex<Vec<Page>>>,
+    slot: Option<OwnedSemaphorePermit>,
+}
+
+impl Drop for PageLease {
+    fn drop(&mut self) {
+        let (Some(page), slot) = (self.page.take(), self.slot.take()) else {
+            return;
+        };
+        let Ok(runtime) = tokio::runtime::Handle::try_current() else {
+            return;
+        };
+        let pool = self.pool.clone();
+        runtime.spawn(async move {
+            release_page(&pool, page).await;
+            drop(slot);
+        });
+    }
+}
+
 #[derive(Clone)]
 pub struct BrowserService {
     browser: Arc<OnceCell<Browser>>,
+    pages: Arc<Mutex<Vec<Page>>>,
+    page_slots: Arc<Semaphore>,
     config: BrowserServiceConfig,
 }
 
@@ -38,6 +122,8 @@ impl BrowserService {
     pub fn new(config: BrowserServiceConfig) -> Self {
         Self {
             browser: Arc::new(OnceCell::new()),
+            pages: Arc::new(Mutex::new(Vec::new())),
+            page_slots: Arc::new(Semaphore::new(config.max_pages.max(1))),
             config,
         }
     }
@@ -93,67 +179,133 @@ impl BrowserService {
         }).await
     }
 
-    pub async fn goto(&self, req: GotoRequest) -> Result<GotoResponse, BrowserError> {
-        let browser = self.get_browser().await?;
-        let page = browser.new_page("about:blank")
-            .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
-
-        page.goto(&req.url)
-            .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+    /// Launch the browser and park one page in the pool, so the first
+    /// request does not pay for Chromium startup
+    pub async fn warm_up(&self) -> Result<(), BrowserError> {
+        self.with_page(|_| async { Ok(()) }).await
+    }
 
-        let title = page.get_title()
-            .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?
-            .unwrap_or_default();
+    /// Run `f` on an idle page, opening a new one only when the pool is empty.
+    /// The page is released through a `PageLease`, so it goes back to the pool
+    /// (or is closed) even if `f` fails or the request is cancelled.
+    async fn with_page<T, F, Fut>(&self, f: F) -> Result<T, BrowserError>
+    where
+        F: FnOnce(Page) -> Fut,
+        Fut: Future<Output = Result<T, BrowserError>>,
+    {
+        let browser = self.get_browser().await?;
 
-        let url = page.url()
+        // Bound concurrent pages so a burst of requests can't exhaust Chromium
+        let slot = self
+            .page_slots
+            .clone()
+            .acquire_owned()
             .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?
-            .map(|u| u.to_string())
-            .unwrap_or_else(|| req.url.clone());
+            .map_err(|e| BrowserError::LaunchFailed(e.to_string()))?;
 
-        page.close().await.ok();
+        let idle = self.pages.lock().unwrap().pop();
+        let page = match idle {
+            Some(page) => page,
+            None => browser.new_page("about:blank")
+                .await
+                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?,
+        };
 
-        Ok(GotoResponse { url, title })
+        let _lease = PageLease {
+            page: Some(page.clone()),
+            pool: self.pages.clone(),
+            slot: Some(slot),
+        };
+        f(page).await
     }
 
-    pub async fn screenshot(&self, req: ScreenshotRequest) -> Result<ScreenshotResponse, BrowserError> {
-        let browser = self.get_browser().await?;
-        let page = browser.new_page("about:blank")
-            .await
-            .map_err(|e| BrowserError::ScreenshotFailed(e.to_string()))?;
-
-        // Navigate if URL provided
-        if let Some(ref url) = req.url {
-            page.goto(url)
+    pub async fn goto(&self, req: GotoRequest) -> Result<GotoResponse, BrowserError> {
+        self.with_page(|page| async move {
+            page.goto(&req.url)
                 .await
                 .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
-        }
 
-        // Take screenshot
-        let screenshot_data = if let Some(ref selector) = req.selector {
-            // Element screenshot
-            let element = page.find_element(selector)
-                .await
-                .map_err(|_| BrowserError::ElementNotFound(selector.clone()))?;
-            element.screenshot(chromiumoxide::cdp::browser_protocol::page::CaptureScreenshotFormat::Png)
+            if let Some(ref selector) = req.wait_for {
+                wait_for_selector(&page, selector, req.timeout).await?;
+            }
+
+            let title = page.get_title()
                 .await
-                .map_err(|e| BrowserError::ScreenshotFailed(e.to_string()))?
-        } else {
-            // Full page screenshot
-            page.screenshot(chromiumoxide::cdp::browser_protocol::page::CaptureScreenshotParams::default())
+                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?
+                .unwrap_or_default();
+
+            let url = page.url()
                 .await
-                .map_err(|e| BrowserError::ScreenshotFailed(e.to_string()))?
+                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?
+                .map(|u| u.to_string())
+                .unwrap_or_else(|| req.url.clone());
+
+            Ok(GotoResponse { url, title })
+        }).await
+    }
+
+    /// Take a screenshot and return the raw image bytes
+    pub async fn capture(&self, req: &ScreenshotRequest) -> Result<Vec<u8>, BrowserError> {
+        let format = match req.format.to_ascii_lowercase().as_str() {
+            "png" => CaptureScreenshotFormat::Png,
+            "jpeg" | "jpg" => CaptureScreenshotFormat::Jpeg,
+            "webp" => CaptureScreenshotFormat::Webp,
+            other => {
+                return Err(BrowserError::InvalidRequest(format!(
+                    "Unsupported screenshot format: {}", other
+                )))
+            }
         };
+        if let Some(quality) = req.quality {
+            if !(0..=100).contains(&quality) {
+                return Err(BrowserError::InvalidRequest(format!(
+                    "Quality must be between 0 and 100, got {}", quality
+                )));
+            }
+        }
 
-        let data = BASE64.encode(&screenshot_data);
+        let timeout = self.config.timeout;
+        self.with_page(|page| async move {
+            // Navigate if URL provided
+            if let Some(ref url) = req.url {
+                page.goto(url)
+                    .await
+                    .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+            }
 
-        page.close().await.ok();
+            if let Some(ref selector) = req.wait_for {
+                wait_for_selector(&page, selector, timeout).await?;
+            }
+
+            // Take screenshot
+            if let Some(ref selector) = req.selector {
+                // Element screenshot
+                let element = page.find_element(selector)
+                    .await
+                    .map_err(|_| BrowserError::ElementNotFound(selector.clone()))?;
+                // Element screenshots take a format only, so quality does not apply
+                element.screenshot(format)
+                    .await
+                    .map_err(|e| BrowserError::ScreenshotFailed(e.to_string()))
+            } else {
+                // Full page screenshot
+                let params = CaptureScreenshotParams {
+                    format: Some(format),
+                    quality: req.quality,
+                    ..Default::default()
+                };
+                page.screenshot(params)
+                    .await
+                    .map_err(|e| BrowserError::ScreenshotFailed(e.to_string()))
+            }
+        }).await
+    }
+
+    pub async fn screenshot(&self, req: ScreenshotRequest) -> Result<ScreenshotResponse, BrowserError> {
+        let screenshot_data = self.capture(&req).await?;
 
         Ok(ScreenshotResponse {
-            data,
+            data: BASE64.encode(&screenshot_data),
             format: req.format,
             width: self.config.viewport_width,
             height: self.config.viewport_height,
@@ -161,77 +313,67 @@ impl BrowserService {
     }
 
     pub async fn evaluate(&self, req: EvaluateRequest) -> Result<EvaluateResponse, BrowserError> {
-        let browser = self.get_browser().await?;
-        let page = browser.new_page("about:blank")
-            .await
-            .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
-
-        if let Some(ref url) = req.url {
-            page.goto(url)
-                .await
-                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
-        }
+        let timeout = self.config.timeout;
+        self.with_page(|page| async move {
+            if let Some(ref url) = req.url {
+                page.goto(url)
+                    .await
+                    .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+            }
 
-        let eval_result = page.evaluate(req.script)
-            .await
-            .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
+            if let Some(ref selector) = req.wait_for {
+                wait_for_selector(&page, selector, timeout).await?;
+            }
 
-        let result = eval_result.into_value()
-            .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
+            let eval_result = page.evaluate(req.script)
+                .await
+                .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
 
-        page.close().await.ok();
+            let result = eval_result.into_value()
+                .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
 
-        Ok(EvaluateResponse { result })
+            Ok(EvaluateResponse { result })
+        }).await
     }
 
     pub async fn click(&self, req: ClickRequest) -> Result<(), BrowserError> {
-        let browser = self.get_browser().await?;
-        let page = browser.new_page("about:blank")
-            .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+        self.with_page(|page| async move {
+            if let Some(ref url) = req.url {
+                page.goto(url)
+                    .await
+                    .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+            }
 
-        if let Some(ref url) = req.url {
-            page.goto(url)
+            let element = page.find_element(&req.selector)
                 .await
-                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
-        }
-
-        let element = page.find_element(&req.selector)
-            .await
-            .map_err(|_| BrowserError::ElementNotFound(req.selector.clone()))?;
+                .map_err(|_| BrowserError::ElementNotFound(req.selector.clone()))?;
 
-        element.click()
-            .await
-            .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
-
-        page.close().await.ok();
+            element.click()
+                .await
+                .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
 
-        Ok(())
+            Ok(())
+        }).await
     }
 
     pub async fn type_text(&self, req: TypeRequest) -> Result<(), BrowserError> {
-        let browser = self.get_browser().await?;
-        let page = browser.new_page("about:blank")
-            .await
-            .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+        self.with_page(|page| async move {
+            if let Some(ref url) = req.url {
+                page.goto(url)
+                    .await
+                    .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
+            }
 
-        if let Some(ref url) = req.url {
-            page.goto(url)
+            let element = page.find_element(&req.selector)
                 .await
-                .map_err(|e| BrowserError::NavigationFailed(e.to_string()))?;
-        }
-
-        let element = page.find_element(&req.selector)
-            .await
-            .map_err(|_| BrowserError::ElementNotFound(req.selector.clone()))?;
-
-        element.type_str(&req.text)
-            .await
-            .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
+                .map_err(|_| BrowserError::ElementNotFound(req.selector.clone()))?;
 
-        page.close().await.ok();
+            element.type_str(&req.text)
+                .await
+                .map_err(|e| BrowserError::ScriptError(e.to_string()))?;
 
-        Ok(())
+            Ok(())
+        }).await
     }
 
     pub fn status(&self) -> BrowserStatus {
@@ -15,7 +15,8 @@ pub struct GotoRequest {
     #[allow(dead_code)] // Reserved for future wait_until support
     #[serde(default)]
     pub wait_until: Option<String>, // "load", "domcontentloaded", "networkidle"
-    #[allow(dead_code)] // Reserved for future timeout support
+    #[serde(default)]
+    pub wait_for: Option<String>, // CSS selector to wait for after navigating
     #[serde(default = "default_timeout")]
     pub timeout: u64,
 }
@@ -31,8 +32,23 @@ pub struct GotoResponse {
 pub struct ScreenshotRequest {
     pub url: Option<String>,
     pub selector: Option<String>,
+    #[serde(default)]
+    pub wait_for: Option<String>, // CSS selector to wait for before capturing
     #[serde(default = "default_format")]
-    pub format: String,
+    pub format: String, // "png", "jpeg", "webp"
+    #[serde(default)]
+    pub quality: Option<i64>, // 0-100, jpeg/webp only
+}
+
+impl ScreenshotRequest {
+    /// MIME type matching the requested image format
+    pub fn content_type(&self) -> &'static str {
+        match self.format.to_ascii_lowercase().as_str() {
+            "jpeg" | "jpg" => "image/jpeg",
+            "webp" => "image/webp",
+            _ => "image/png",
+        }
+    }
 }
 
 #[derive(Debug, Serialize)]
@@ -47,6 +63,8 @@ pub struct ScreenshotResponse {
 #[derive(Debug, Deserialize)]
 pub struct EvaluateRequest {
     pub url: Option<String>,
+    #[serde(default)]
+    pub wait_for: Option<String>, // CSS selector to wait for before evaluating
     pub script: String,
 }
 
@@ -70,6 +88,12 @@ pub struct TypeRequest {
     pub text: String,
 }
 
+// Response for POST /browser/click and /browser/type
+#[derive(Debug, Serialize)]
+pub struct ActionResponse {
+    pub success: bool,
+}
+
 // GET /browser/status
 #[derive(Debug, Serialize)]
 pub struct BrowserStatus {
@@ -92,10 +116,12 @@ pub enum BrowserError {
     #[error("JavaScript error: {0}")]
     ScriptError(String),
 
-    #[allow(dead_code)] // Reserved for future timeout support
     #[error("Timeout after {0}s")]
     Timeout(u64),
 
     #[error("Screenshot failed: {0}")]
     ScreenshotFailed(String),
+
+    #[error("Invalid request: {0}")]
+    InvalidRequest(String),
 }
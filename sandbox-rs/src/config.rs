@@ -1,4 +1,5 @@
 use std::env;
+use std::str::FromStr;
 
 #[derive(Debug, Clone)]
 pub struct Config {
@@ -10,10 +11,21 @@ pub struct Config {
     pub cdp_port: u16,
     pub skills_dir: String,
     pub browser_headless: bool,
+    pub browser_prelaunch: bool,
     pub browser_executable: Option<String>,
     pub browser_viewport_width: u32,
     pub browser_viewport_height: u32,
     pub browser_timeout: u64,
+    pub browser_max_pages: usize,
+}
+
+/// Read and parse an environment variable, falling back to `default` when
+/// it is unset or does not parse
+fn env_parse<T: FromStr>(key: &str, default: T) -> T {
+    env::var(key)
+        .ok()
+        .and_then(|v| v.parse().ok())
+        .unwrap_or(default)
 }
 
 impl Config {
@@ -23,34 +35,23 @@ impl Config {
 
         Self {
             host: env::var("HOST").unwrap_or_else(|_| "0.0.0.0".into()),
-            port: env::var("PORT")
-                .ok()
-                .and_then(|p| p.parse().ok())
-                .unwrap_or(8080),
+            port: env_parse("PORT", 8080),
             workspace: workspace.clone(),
             display: env::var("DISPLAY").unwrap_or_else(|_| ":99".into()),
-            cdp_port: env::var("CDP_PORT")
-                .ok()
-                .and_then(|p| p.parse().ok())
-                .unwrap_or(9222),
+            cdp_port: env_parse("CDP_PORT", 9222),
             skills_dir: env::var("SKILLS_DIR")
                 .unwrap_or_else(|_| format!("{}/.skills", workspace)),
             browser_headless: env::var("BROWSER_HEADLESS")
                 .map(|v| v != "false" && v != "0")
                 .unwrap_or(true),
+            browser_prelaunch: env::var("BROWSER_PRELAUNCH")
+                .map(|v| v == "true" || v == "1")
+                .unwrap_or(false),
             browser_executable: env::var("BROWSER_EXECUTABLE").ok(),
-            browser_viewport_width: env::var("BROWSER_VIEWPORT_WIDTH")
-                .ok()
-                .and_then(|p| p.parse().ok())
-                .unwrap_or(1280),
-            browser_viewport_height: env::var("BROWSER_VIEWPORT_HEIGHT")
-                .ok()
-                .and_then(|p| p.parse().ok())
-                .unwrap_or(720),
-            browser_timeout: env::var("BROWSER_TIMEOUT")
-                .ok()
-                .and_then(|p| p.parse().ok())
-                .unwrap_or(30),
+            browser_viewport_width: env_parse("BROWSER_VIEWPORT_WIDTH", 1280),
+            browser_viewport_height: env_parse("BROWSER_VIEWPORT_HEIGHT", 720),
+            browser_timeout: env_parse("BROWSER_TIMEOUT", 30),
+            browser_max_pages: env_parse("BROWSER_MAX_PAGES", 8),
         }
     }
 }
@@ -1,12 +1,17 @@
 use std::sync::Arc;
-use axum::{extract::State, Json};
+use axum::{
+    extract::State,
+    http::header,
+    response::{IntoResponse, Response},
+    Json,
+};
 use crate::state::AppState;
 use crate::error::{AppError, Result};
 use crate::browser::{
     GotoRequest, GotoResponse,
     ScreenshotRequest, ScreenshotResponse,
     EvaluateRequest, EvaluateResponse,
-    ClickRequest, TypeRequest,
+    ClickRequest, TypeRequest, ActionResponse,
     BrowserStatus, BrowserError,
 };
 
@@ -20,6 +25,7 @@ impl From<BrowserError> for AppError {
             BrowserError::NavigationFailed(msg) => AppError::Internal(format!("Navigation failed: {}", msg)),
             BrowserError::ScriptError(msg) => AppError::BadRequest(format!("Script error: {}", msg)),
             BrowserError::ScreenshotFailed(msg) => AppError::Internal(format!("Screenshot failed: {}", msg)),
+            BrowserError::InvalidRequest(msg) => AppError::BadRequest(msg),
         }
     }
 }
@@ -42,6 +48,15 @@ pub async fn browser_screenshot(
     Ok(Json(response))
 }
 
+// POST /browser/screenshot/raw - Take a screenshot, returned as image bytes
+pub async fn browser_screenshot_raw(
+    State(state): State<Arc<AppState>>,
+    Json(req): Json<ScreenshotRequest>,
+) -> Result<Response> {
+    let data = state.browser.capture(&req).await?;
+    Ok(([(header::CONTENT_TYPE, req.content_type())], data).into_response())
+}
+
 // POST /browser/evaluate - Evaluate JavaScript
 pub async fn browser_evaluate(
     State(state): State<Arc<AppState>>,
@@ -55,18 +70,18 @@ pub async fn browser_evaluate(
 pub async fn browser_click(
     State(state): State<Arc<AppState>>,
     Json(req): Json<ClickRequest>,
-) -> Result<Json<serde_json::Value>> {
+) -> Result<Json<ActionResponse>> {
     state.browser.click(req).await?;
-    Ok(Json(serde_json::json!({"success": true})))
+    Ok(Json(ActionResponse { success: true }))
 }
 
 // POST /browser/type - Type text into an element
 pub async fn browser_type(
     State(state): State<Arc<AppState>>,
     Json(req): Json<TypeRequest>,
-) -> Result<Json<serde_json::Value>> {
+) -> Result<Json<ActionResponse>> {
     state.browser.type_text(req).await?;
-    Ok(Json(serde_json::json!({"success": true})))
+    Ok(Json(ActionResponse { success: true }))
 }
 
 // GET /browser/status - Get browser status
@@ -1,9 +1,11 @@
 use axum::{extract::State, Json};
 use serde::{Deserialize, Serialize};
+use std::path::{Path, PathBuf};
 use std::sync::Arc;
 use std::time::Instant;
 use tokio::fs;
 use tokio::process::Command;
+use tokio::sync::OnceCell;
 use tokio::time::{timeout, Duration};
 
 use crate::error::{AppError, Result};
@@ -12,36 +14,102 @@ use crate::state::AppState;
 #[derive(Debug, Clone)]
 struct LangConfig {
     ext: &'static str,
-    cmd: &'static str,
+    /// Program and leading arguments; the snippet path is appended
+    cmd: &'static [&'static str],
+    /// Compile with `cmd -o <binary> <snippet>`, then run the binary
+    compiled: bool,
 }
 
-fn get_lang_config(language: &str) -> Option<LangConfig> {
-    match language.to_lowercase().as_str() {
-        "python" => Some(LangConfig {
+static LANGUAGES: [(&str, LangConfig); 6] = [
+    (
+        "python",
+        LangConfig {
             ext: ".py",
-            cmd: "python3",
-        }),
-        "javascript" => Some(LangConfig {
+            cmd: &["python3"],
+            compiled: false,
+        },
+    ),
+    (
+        "javascript",
+        LangConfig {
             ext: ".js",
-            cmd: "node",
-        }),
-        "typescript" => Some(LangConfig {
+            cmd: &["node"],
+            compiled: false,
+        },
+    ),
+    (
+        "typescript",
+        LangConfig {
             ext: ".ts",
-            cmd: "npx tsx",
-        }),
-        "go" => Some(LangConfig {
+            cmd: &["npx", "tsx"],
+            compiled: false,
+        },
+    ),
+    (
+        "go",
+        LangConfig {
             ext: ".go",
-            cmd: "go run",
-        }),
-        "rust" => Some(LangConfig {
+            cmd: &["go", "run"],
+            compiled: false,
+        },
+    ),
+    (
+        "rust",
+        LangConfig {
             ext: ".rs",
-            cmd: "rustc -o /tmp/rust_out && /tmp/rust_out",
-        }),
-        "bash" => Some(LangConfig {
+            cmd: &["rustc"],
+            compiled: true,
+        },
+    ),
+    (
+        "bash",
+        LangConfig {
             ext: ".sh",
-            cmd: "bash",
-        }),
-        _ => None,
+            cmd: &["bash"],
+            compiled: false,
+        },
+    ),
+];
+
+/// Case-insensitive lookup without allocating a lowercased copy
+fn get_lang_config(language: &str) -> Option<&'static LangConfig> {
+    LANGUAGES
+        .iter()
+        .find(|(name, _)| name.eq_ignore_ascii_case(language))
+        .map(|(_, config)| config)
+}
+
+/// Scratch directory for code snippets, created on first use. Prefers
+/// tmpfs so snippet files stay in memory.
+static CODE_DIR: OnceCell<PathBuf> = OnceCell::const_new();
+
+async fn code_dir() -> Result<&'static Path> {
+    CODE_DIR
+        .get_or_try_init(|| async {
+            let base = if fs::try_exists("/dev/shm").await.unwrap_or(false) {
+                PathBuf::from("/dev/shm")
+            } else {
+                std::env::temp_dir()
+            };
+            let dir = base.join("sandbox-code");
+            fs::create_dir_all(&dir).await?;
+            Ok(dir)
+        })
+        .await
+        .map(PathBuf::as_path)
+}
+
+/// Scratch files of one execution. They are removed on drop, so a request
+/// cancelled by a client disconnect leaves nothing behind in tmpfs either.
+struct ScratchFiles {
+    snippet: PathBuf,
+    binary: PathBuf,
+}
+
+impl Drop for ScratchFiles {
+    fn drop(&mut self) {
+        let _ = std::fs::remove_file(&self.snippet);
+        let _ = std::fs::remove_file(&self.binary);
     }
 }
 
@@ -74,38 +142,52 @@ pub async fn execute_code(
 
     let start = Instant::now();
 
-    // Create temp file
-    let tmp_path = format!("/tmp/code_{}{}", std::process::id(), config.ext);
-    fs::write(&tmp_path, &req.code)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
-
-    // Build command
-    let full_cmd = if config.cmd.contains("&&") {
-        // Rust special case: compile and run
-        config.cmd.replace(
-            "/tmp/rust_out",
-            &format!("/tmp/rust_out_{}", std::process::id()),
-        ) + " "
-            + &tmp_path
-    } else {
-        format!("{} {}", config.cmd, tmp_path)
+    // Unique per request, so concurrent executions never share files
+    let id = uuid::Uuid::new_v4().simple().to_string();
+    let scratch = ScratchFiles {
+        snippet: code_dir()
+            .await?
+            .join(format!("snippet_{}{}", id, config.ext)),
+        // Compiled binaries go in the regular temp dir; tmpfs is often noexec
+        binary: std::env::temp_dir().join(format!("rust_out_{}", id)),
     };
+    let (tmp_path, bin_path) = (&scratch.snippet, &scratch.binary);
+    fs::write(tmp_path, &req.code).await?;
 
-    let mut cmd = Command::new("sh");
-    cmd.arg("-c")
-        .arg(&full_cmd)
-        .current_dir(&state.config.workspace);
+    // Exec the toolchain directly rather than through sh -c
+    let workspace = &state.config.workspace;
+    let run = async {
+        // Killed if the request is dropped, so nothing writes to the
+        // scratch files after they are removed
+        let mut cmd = Command::new(config.cmd[0]);
+        cmd.args(&config.cmd[1..])
+            .current_dir(workspace)
+            .kill_on_drop(true);
 
-    let result = timeout(Duration::from_secs(req.timeout), cmd.output()).await;
+        if !config.compiled {
+            return cmd.arg(tmp_path).output().await;
+        }
 
-    // Cleanup temp file
-    let _ = fs::remove_file(&tmp_path).await;
-    let _ = fs::remove_file(format!("/tmp/rust_out_{}", std::process::id())).await;
+        let compile = cmd.arg("-o").arg(bin_path).arg(tmp_path).output().await?;
+        if !compile.status.success() {
+            return Ok(compile);
+        }
 
-    let output = result
-        .map_err(|_| AppError::Timeout("Execution timed out".into()))?
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+        // Report compiler warnings ahead of the program's own output
+        let mut output = Command::new(bin_path)
+            .current_dir(workspace)
+            .kill_on_drop(true)
+            .output()
+            .await?;
+        output.stdout.splice(0..0, compile.stdout);
+        output.stderr.splice(0..0, compile.stderr);
+        Ok(output)
+    };
+
+    let result = timeout(Duration::from_secs(req.timeout), run).await;
+    drop(scratch);
+
+    let output = result.map_err(|_| AppError::Timeout("Execution timed out".into()))??;
 
     Ok(Json(CodeExecResponse {
         output: String::from_utf8_lossy(&output.stdout).into_owned(),
@@ -114,3 +196,31 @@ pub async fn execute_code(
         duration_ms: start.elapsed().as_secs_f64() * 1000.0,
     }))
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_get_lang_config_ignores_case() {
+        assert_eq!(get_lang_config("python").unwrap().ext, ".py");
+        assert_eq!(get_lang_config("Python").unwrap().ext, ".py");
+        assert_eq!(get_lang_config("RUST").unwrap().cmd, &["rustc"]);
+        assert!(get_lang_config("cobol").is_none());
+    }
+
+    #[test]
+    fn test_scratch_files_removed_on_drop() {
+        let dir = tempfile::tempdir().unwrap();
+        let scratch = ScratchFiles {
+            snippet: dir.path().join("snippet.py"),
+            binary: dir.path().join("rust_out"),
+        };
+        std::fs::write(&scratch.snippet, "print(1)").unwrap();
+        std::fs::write(&scratch.binary, "bin").unwrap();
+        let paths = [scratch.snippet.clone(), scratch.binary.clone()];
+
+        drop(scratch);
+        assert!(paths.iter().all(|p| !p.exists()));
+    }
+}
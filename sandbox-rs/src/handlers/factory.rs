@@ -120,27 +120,21 @@ pub async fn check_trigger(
 /// - Remove consecutive hyphens
 /// - Trim hyphens from start/end
 fn sanitize_skill_name(goal: &str) -> String {
-    let mut name = goal
-        .to_lowercase()
-        .chars()
-        .map(|c| {
-            if c.is_alphanumeric() {
-                c
-            } else if c.is_whitespace() || c == '_' {
-                '-'
-            } else {
-                '-'
-            }
-        })
-        .collect::<String>();
-
-    // Remove consecutive hyphens
-    while name.contains("--") {
-        name = name.replace("--", "-");
+    let mut name = String::with_capacity(goal.len());
+
+    // Single pass: leading separators are skipped and runs collapse to one hyphen
+    for c in goal.chars().flat_map(char::to_lowercase) {
+        if c.is_alphanumeric() {
+            name.push(c);
+        } else if !name.is_empty() && !name.ends_with('-') {
+            name.push('-');
+        }
     }
 
-    // Trim hyphens from start and end
-    name = name.trim_matches('-').to_string();
+    // Trim trailing hyphen
+    if name.ends_with('-') {
+        name.pop();
+    }
 
     // Ensure name is not empty
     if name.is_empty() {
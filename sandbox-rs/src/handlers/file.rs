@@ -1,18 +1,29 @@
 use axum::{
+    body::Body,
     extract::{Multipart, Query, State},
-    http::{header, StatusCode},
+    http::{header, HeaderMap, HeaderName, StatusCode},
     response::{IntoResponse, Response},
     Json,
 };
+use futures::StreamExt;
 use serde::{Deserialize, Serialize};
-use std::path::PathBuf;
+use std::io::{Read, Write};
+use std::path::{Path, PathBuf};
 use std::sync::Arc;
+use std::time::UNIX_EPOCH;
 use tokio::fs;
-use tokio::io::AsyncReadExt;
+use tokio::io::{AsyncWriteExt, BufWriter};
+use tokio_util::io::ReaderStream;
 
 use crate::error::{AppError, Result};
 use crate::state::AppState;
 
+/// Buffer size used when streaming file contents into a response body
+const STREAM_CHUNK_SIZE: usize = 64 * 1024;
+
+/// Cache-Control for file contents: clients may cache but must revalidate
+const REVALIDATE: &str = "max-age=0, must-revalidate";
+
 fn resolve_path(base: &str, path: &str) -> PathBuf {
     if path.starts_with('/') {
         PathBuf::from(path)
@@ -21,13 +32,124 @@ fn resolve_path(base: &str, path: &str) -> PathBuf {
     }
 }
 
+/// Run a group of blocking filesystem calls on the blocking pool in a
+/// single hop, rather than one tokio::fs round trip per call
+async fn run_blocking<T, F>(f: F) -> Result<T>
+where
+    F: FnOnce() -> Result<T> + Send + 'static,
+    T: Send + 'static,
+{
+    tokio::task::spawn_blocking(f)
+        .await
+        .map_err(|e| AppError::Internal(e.to_string()))?
+}
+
+/// Map a missing file to a 404; other io errors stay 500s
+fn file_not_found(e: std::io::Error) -> AppError {
+    if e.kind() == std::io::ErrorKind::NotFound {
+        AppError::NotFound("File not found".into())
+    } else {
+        e.into()
+    }
+}
+
+/// Name prefix of in-progress spool files, which /file/list leaves out
+const SPOOL_PREFIX: &str = ".upload-";
+
+/// Temporary file for a write in progress. It is removed on drop unless
+/// `keep` was called, so both failed requests and cancelled ones (axum drops
+/// the handler future when the client disconnects) leave nothing behind.
+struct Spool {
+    path: PathBuf,
+    keep: bool,
+}
+
+impl Spool {
+    /// A new hidden spool path inside `dir`
+    fn new(dir: &Path) -> Self {
+        Self {
+            path: dir.join(format!("{}{}", SPOOL_PREFIX, uuid::Uuid::new_v4())),
+            keep: false,
+        }
+    }
+
+    /// The spool has been moved into place; don't remove it
+    fn keep(mut self) {
+        self.keep = true;
+    }
+}
+
+impl Drop for Spool {
+    fn drop(&mut self) {
+        if !self.keep {
+            let _ = std::fs::remove_file(&self.path);
+        }
+    }
+}
+
+/// Weak ETag from inode, size and modification time, so no content hashing.
+/// The inode catches files replaced by rename with the same size and mtime.
+fn file_etag(metadata: &std::fs::Metadata) -> String {
+    #[cfg(unix)]
+    let ino = std::os::unix::fs::MetadataExt::ino(metadata);
+    #[cfg(not(unix))]
+    let ino = 0u64;
+
+    let mtime = metadata
+        .modified()
+        .ok()
+        .and_then(|t| t.duration_since(UNIX_EPOCH).ok())
+        .map(|d| d.as_nanos())
+        .unwrap_or(0);
+    format!("W/\"{:x}-{:x}-{:x}\"", ino, metadata.len(), mtime)
+}
+
+/// Whether If-None-Match already names `etag` (weak comparison)
+fn etag_matches(headers: &HeaderMap, etag: &str) -> bool {
+    let Some(value) = headers
+        .get(header::IF_NONE_MATCH)
+        .and_then(|v| v.to_str().ok())
+    else {
+        return false;
+    };
+
+    let etag = etag.trim_start_matches("W/");
+    value
+        .split(',')
+        .map(str::trim)
+        .any(|tag| tag == "*" || tag.trim_start_matches("W/") == etag)
+}
+
+fn not_modified(etag: &str) -> Response {
+    (StatusCode::NOT_MODIFIED, [(header::ETAG, etag)]).into_response()
+}
+
+/// Open a file as a streaming response body, returning it with the file
+/// size and ETag
+async fn stream_file(path: &Path) -> Result<(Body, u64, String)> {
+    let file = fs::File::open(path).await.map_err(file_not_found)?;
+    let metadata = file.metadata().await?;
+
+    // Opening a directory succeeds, but reading it fails mid-body
+    if !metadata.is_file() {
+        return Err(AppError::BadRequest("Path is not a regular file".into()));
+    }
+
+    // Stream the file in fixed-size chunks instead of buffering it whole
+    let body = Body::from_stream(ReaderStream::with_capacity(file, STREAM_CHUNK_SIZE));
+
+    Ok((body, metadata.len(), file_etag(&metadata)))
+}
+
 // Read file
 #[derive(Debug, Deserialize)]
 pub struct FileReadQuery {
     pub path: String,
     #[serde(default = "default_encoding")]
-    #[allow(dead_code)]
-    pub encoding: String,
+    pub encoding: String, // "utf-8", or "binary" for the raw bytes
+    /// Return the text as a text/plain body instead of a JSON object
+    #[serde(default)]
+    pub raw: bool,
 }
 
 fn default_encoding() -> String {
@@ -43,27 +165,74 @@ pub struct FileReadResponse {
 
 pub async fn read_file(
     State(state): State<Arc<AppState>>,
+    headers: HeaderMap,
     Query(query): Query<FileReadQuery>,
-) -> Result<Json<FileReadResponse>> {
+) -> Result<Response> {
     let full_path = resolve_path(&state.config.workspace, &query.path);
 
-    if !full_path.exists() {
-        return Err(AppError::NotFound("File not found".into()));
+    // Binary reads skip UTF-8 decoding and JSON escaping entirely
+    if query.encoding.eq_ignore_ascii_case("binary") {
+        let (body, size, etag) = stream_file(&full_path).await?;
+        if etag_matches(&headers, &etag) {
+            return Ok(not_modified(&etag));
+        }
+        return Ok((
+            [
+                (header::CONTENT_TYPE, "application/octet-stream"),
+                (header::CONTENT_LENGTH, &size.to_string()),
+                (header::ETAG, &etag),
+                (header::CACHE_CONTROL, REVALIDATE),
+            ],
+            body,
+        )
+            .into_response());
     }
 
-    let content = fs::read_to_string(&full_path)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+    // Open, stat and (unless the client's copy is current) read in one
+    // blocking task
+    let (content, etag) = run_blocking(move || {
+        let mut file = std::fs::File::open(&full_path).map_err(file_not_found)?;
+        let etag = file_etag(&file.metadata()?);
+        if etag_matches(&headers, &etag) {
+            return Ok((None, etag));
+        }
 
-    let metadata = fs::metadata(&full_path)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+        let mut content = String::new();
+        file.read_to_string(&mut content)?;
+        Ok((Some(content), etag))
+    })
+    .await?;
+
+    let Some(content) = content else {
+        return Ok(not_modified(&etag));
+    };
+    let size = content.len() as u64;
+
+    if query.raw {
+        return Ok((
+            [
+                (header::CONTENT_TYPE, "text/plain; charset=utf-8"),
+                (HeaderName::from_static("x-file-size"), &size.to_string()),
+                (header::ETAG, &etag),
+                (header::CACHE_CONTROL, REVALIDATE),
+            ],
+            content,
+        )
+            .into_response());
+    }
 
-    Ok(Json(FileReadResponse {
-        content,
-        size: metadata.len(),
-        mime_type: "text/plain".into(),
-    }))
+    Ok((
+        [
+            (header::ETAG, etag.as_str()),
+            (header::CACHE_CONTROL, REVALIDATE),
+        ],
+        Json(FileReadResponse {
+            content,
+            size,
+            mime_type: "text/plain".into(),
+        }),
+    )
+        .into_response())
 }
 
 // Write file
@@ -90,30 +259,99 @@ pub async fn write_file(
     Json(req): Json<FileWriteRequest>,
 ) -> Result<Json<FileWriteResponse>> {
     let full_path = resolve_path(&state.config.workspace, &req.path);
+    let size = req.content.len() as u64;
 
-    // Create parent directories
-    if let Some(parent) = full_path.parent() {
-        fs::create_dir_all(parent)
-            .await
-            .map_err(|e| AppError::Internal(e.to_string()))?;
-    }
+    // Create parent directories, write and chmod in one blocking task
+    let path = full_path.clone();
+    run_blocking(move || {
+        // Only walk the parent directories when the create says they're missing
+        let mut file = match std::fs::File::create(&path) {
+            Err(e) if e.kind() == std::io::ErrorKind::NotFound => {
+                if let Some(parent) = path.parent() {
+                    std::fs::create_dir_all(parent)?;
+                }
+                std::fs::File::create(&path)?
+            }
+            result => result?,
+        };
 
-    fs::write(&full_path, &req.content)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+        file.write_all(req.content.as_bytes())?;
+
+        // Set file mode on the open handle (Unix only)
+        #[cfg(unix)]
+        {
+            use std::os::unix::fs::PermissionsExt;
+            let mode = u32::from_str_radix(&req.mode, 8).unwrap_or(0o644);
+            let perms = std::fs::Permissions::from_mode(mode);
+            file.set_permissions(perms)?;
+        }
+
+        Ok(())
+    })
+    .await?;
+
+    Ok(Json(FileWriteResponse {
+        path: full_path.to_string_lossy().into_owned(),
+        size,
+    }))
+}
+
+// Write file from the raw request body
+#[derive(Debug, Deserialize)]
+pub struct FileWriteRawQuery {
+    pub path: String,
+    /// Octal mode; when omitted an existing file keeps its mode and a new
+    /// one gets 644
+    pub mode: Option<String>,
+}
+
+/// Stream the request body straight to disk, skipping the JSON encoding
+/// and never holding the whole content in memory
+pub async fn write_file_raw(
+    State(state): State<Arc<AppState>>,
+    Query(query): Query<FileWriteRawQuery>,
+    body: Body,
+) -> Result<Json<FileWriteResponse>> {
+    let full_path = resolve_path(&state.config.workspace, &query.path);
+    let dir = full_path.parent().unwrap_or(Path::new("/"));
+
+    // Spool next to the destination and rename once the whole body is in,
+    // so a failed or dropped request never leaves the old file truncated
+    let spool = Spool::new(dir);
+    let file = match fs::File::create(&spool.path).await {
+        Err(e) if e.kind() == std::io::ErrorKind::NotFound => {
+            fs::create_dir_all(dir).await?;
+            fs::File::create(&spool.path).await?
+        }
+        result => result?,
+    };
+    let mut writer = BufWriter::with_capacity(STREAM_CHUNK_SIZE, file);
+
+    let mut stream = body.into_data_stream();
+    let mut size = 0u64;
+    while let Some(chunk) = stream.next().await {
+        let chunk = chunk.map_err(|e| AppError::BadRequest(e.to_string()))?;
+        writer.write_all(&chunk).await?;
+        size += chunk.len() as u64;
+    }
+    writer.flush().await?;
 
-    // Set file mode (Unix only)
     #[cfg(unix)]
     {
         use std::os::unix::fs::PermissionsExt;
-        let mode = u32::from_str_radix(&req.mode, 8).unwrap_or(0o644);
+        let mode = query
+            .mode
+            .as_deref()
+            .and_then(|m| u32::from_str_radix(m, 8).ok())
+            .unwrap_or(0o644);
         let perms = std::fs::Permissions::from_mode(mode);
-        fs::set_permissions(&full_path, perms)
-            .await
-            .map_err(|e| AppError::Internal(e.to_string()))?;
+        writer.get_ref().set_permissions(perms).await?;
     }
+    drop(writer);
 
-    let size = req.content.len() as u64;
+    let keep_mode = query.mode.is_none();
+    move_into_place(spool.path.clone(), full_path.clone(), keep_mode).await?;
+    spool.keep();
 
     Ok(Json(FileWriteResponse {
         path: full_path.to_string_lossy().into_owned(),
@@ -127,6 +365,8 @@ pub struct FileListQuery {
     pub path: String,
     #[serde(default)]
     pub recursive: bool,
+    /// Stop after this many entries; unlimited when omitted
+    pub limit: Option<usize>,
 }
 
 #[derive(Debug, Serialize)]
@@ -134,15 +374,27 @@ pub struct FileEntry {
     pub name: String,
     pub path: String,
     #[serde(rename = "type")]
-    pub file_type: String,
+    pub file_type: &'static str,
     pub size: u64,
-    pub modified: String,
+    #[serde(serialize_with = "serialize_rfc3339")]
+    pub modified: chrono::DateTime<chrono::Utc>,
+}
+
+/// Same output as `to_rfc3339()`, including the `+00:00` offset, but written
+/// straight into the response without an intermediate String
+fn serialize_rfc3339<S: serde::Serializer>(
+    time: &chrono::DateTime<chrono::Utc>,
+    serializer: S,
+) -> std::result::Result<S::Ok, S::Error> {
+    serializer.collect_str(&time.format("%Y-%m-%dT%H:%M:%S%.f%:z"))
 }
 
 #[derive(Debug, Serialize)]
 pub struct FileListResponse {
     pub path: String,
     pub entries: Vec<FileEntry>,
+    /// Set when the walk stopped at the requested `limit`
+    pub truncated: bool,
 }
 
 pub async fn list_files(
@@ -151,63 +403,75 @@ pub async fn list_files(
 ) -> Result<Json<FileListResponse>> {
     let full_path = resolve_path(&state.config.workspace, &query.path);
 
-    if !full_path.exists() {
-        return Err(AppError::NotFound("Path not found".into()));
-    }
-
-    let mut entries = Vec::new();
-
-    if query.recursive {
-        collect_entries_recursive(&full_path, &mut entries).await?;
-    } else {
-        let mut dir = fs::read_dir(&full_path)
-            .await
-            .map_err(|e| AppError::Internal(e.to_string()))?;
-
-        while let Some(entry) = dir
-            .next_entry()
-            .await
-            .map_err(|e| AppError::Internal(e.to_string()))?
-        {
-            if let Some(file_entry) = entry_to_file_entry(&entry).await {
-                entries.push(file_entry);
+    // Walk the whole tree in one blocking task instead of a tokio::fs
+    // round trip per directory entry
+    let root = full_path.clone();
+    let (entries, truncated) = run_blocking(move || {
+        let dir = std::fs::read_dir(&root).map_err(|e| {
+            if e.kind() == std::io::ErrorKind::NotFound {
+                AppError::NotFound("Path not found".into())
+            } else {
+                e.into()
             }
-        }
-    }
+        })?;
+
+        let mut entries = Vec::new();
+        let limit = query.limit.unwrap_or(usize::MAX);
+        let truncated = !collect_entries(dir, query.recursive, limit, &mut entries)?;
+        Ok((entries, truncated))
+    })
+    .await?;
 
     Ok(Json(FileListResponse {
         path: full_path.to_string_lossy().into_owned(),
         entries,
+        truncated,
     }))
 }
 
-async fn collect_entries_recursive(path: &PathBuf, entries: &mut Vec<FileEntry>) -> Result<()> {
-    let mut dir = fs::read_dir(path)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+/// Collect entries until `limit` is reached. Returns false if the walk
+/// stopped early, so huge trees cost at most `limit` entries of memory.
+fn collect_entries(
+    dir: std::fs::ReadDir,
+    recursive: bool,
+    limit: usize,
+    entries: &mut Vec<FileEntry>,
+) -> Result<bool> {
+    for entry in dir {
+        if entries.len() >= limit {
+            return Ok(false);
+        }
 
-    while let Some(entry) = dir
-        .next_entry()
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?
-    {
-        if let Some(file_entry) = entry_to_file_entry(&entry).await {
+        let entry = entry?;
+
+        // Spools sit next to their destination until the write completes
+        if entry
+            .file_name()
+            .to_str()
+            .is_some_and(|name| name.starts_with(SPOOL_PREFIX))
+        {
+            continue;
+        }
+
+        if let Some(file_entry) = entry_to_file_entry(&entry) {
             let is_dir = file_entry.file_type == "directory";
             entries.push(file_entry);
 
-            if is_dir {
-                Box::pin(collect_entries_recursive(&entry.path(), entries)).await?;
+            if recursive
+                && is_dir
+                && !collect_entries(std::fs::read_dir(entry.path())?, recursive, limit, entries)?
+            {
+                return Ok(false);
             }
         }
     }
 
-    Ok(())
+    Ok(true)
 }
 
-async fn entry_to_file_entry(entry: &fs::DirEntry) -> Option<FileEntry> {
-    let metadata = entry.metadata().await.ok()?;
+fn entry_to_file_entry(entry: &std::fs::DirEntry) -> Option<FileEntry> {
+    let metadata = entry.metadata().ok()?;
     let modified = metadata.modified().ok()?;
-    let datetime: chrono::DateTime<chrono::Utc> = modified.into();
 
     Some(FileEntry {
         name: entry.file_name().to_string_lossy().into_owned(),
@@ -216,11 +480,55 @@ async fn entry_to_file_entry(entry: &fs::DirEntry) -> Option<FileEntry> {
             "directory"
         } else {
             "file"
-        }
-        .into(),
+        },
         size: metadata.len(),
-        modified: datetime.to_rfc3339(),
+        modified: modified.into(),
+    })
+}
+
+// Delete files
+#[derive(Debug, Deserialize)]
+pub struct FileDeleteRequest {
+    pub paths: Vec<String>,
+}
+
+#[derive(Debug, Serialize)]
+pub struct FileDeleteResponse {
+    pub deleted: usize,
+}
+
+/// Remove files and directory trees with direct syscalls, all in one
+/// blocking task. Paths that are already gone are skipped.
+pub async fn delete_files(
+    State(state): State<Arc<AppState>>,
+    Json(req): Json<FileDeleteRequest>,
+) -> Result<Json<FileDeleteResponse>> {
+    let paths: Vec<PathBuf> = req
+        .paths
+        .iter()
+        .map(|p| resolve_path(&state.config.workspace, p))
+        .collect();
+
+    let deleted = run_blocking(move || {
+        let mut deleted = 0;
+        for path in &paths {
+            // symlink_metadata so a link to a directory is unlinked, not followed
+            let result = match std::fs::symlink_metadata(path) {
+                Ok(m) if m.is_dir() => std::fs::remove_dir_all(path),
+                Ok(_) => std::fs::remove_file(path),
+                Err(e) => Err(e),
+            };
+            match result {
+                Ok(()) => deleted += 1,
+                Err(e) if e.kind() == std::io::ErrorKind::NotFound => {}
+                Err(e) => return Err(e.into()),
+            }
+        }
+        Ok(deleted)
     })
+    .await?;
+
+    Ok(Json(FileDeleteResponse { deleted }))
 }
 
 // Upload file (multipart)
@@ -228,10 +536,22 @@ pub async fn upload_file(
     State(state): State<Arc<AppState>>,
     mut multipart: Multipart,
 ) -> Result<Json<FileWriteResponse>> {
-    let mut file_data: Option<Vec<u8>> = None;
-    let mut file_path: Option<String> = None;
+    let (full_path, size) = receive_upload(&mut multipart, &state.config.workspace).await?;
 
-    while let Some(field) = multipart
+    Ok(Json(FileWriteResponse {
+        path: full_path.to_string_lossy().into_owned(),
+        size,
+    }))
+}
+
+/// Read the multipart fields, spool the file part to disk chunk by chunk
+/// and move it to its destination. Returns the destination and size.
+async fn receive_upload(multipart: &mut Multipart, workspace: &str) -> Result<(PathBuf, u64)> {
+    let mut spool: Option<Spool> = None;
+    let mut file_size: Option<u64> = None;
+    let mut file_path: Option<PathBuf> = None;
+
+    while let Some(mut field) = multipart
         .next_field()
         .await
         .map_err(|e| AppError::BadRequest(e.to_string()))?
@@ -240,45 +560,75 @@ pub async fn upload_file(
 
         match name.as_str() {
             "file" => {
-                file_data = Some(
-                    field
-                        .bytes()
-                        .await
-                        .map_err(|e| AppError::Internal(e.to_string()))?
-                        .to_vec(),
-                );
+                // If the path part came first, spool next to the destination
+                // so the final rename never has to copy across filesystems
+                let dir = match file_path.as_deref().and_then(Path::parent) {
+                    Some(parent) => {
+                        fs::create_dir_all(parent).await?;
+                        parent.to_path_buf()
+                    }
+                    None => std::env::temp_dir(),
+                };
+                let tmp = spool.insert(Spool::new(&dir));
+
+                let mut file = fs::File::create(&tmp.path).await?;
+                let mut written = 0u64;
+                while let Some(chunk) = field
+                    .chunk()
+                    .await
+                    .map_err(|e| AppError::Internal(e.to_string()))?
+                {
+                    file.write_all(&chunk).await?;
+                    written += chunk.len() as u64;
+                }
+                file.flush().await?;
+                file_size = Some(written);
             }
             "path" => {
-                file_path = Some(
-                    field
-                        .text()
-                        .await
-                        .map_err(|e| AppError::Internal(e.to_string()))?,
-                );
+                let path = field
+                    .text()
+                    .await
+                    .map_err(|e| AppError::Internal(e.to_string()))?;
+                file_path = Some(resolve_path(workspace, &path));
             }
             _ => {}
         }
     }
 
-    let data = file_data.ok_or_else(|| AppError::BadRequest("Missing file field".into()))?;
-    let path = file_path.ok_or_else(|| AppError::BadRequest("Missing path field".into()))?;
+    let size = file_size.ok_or_else(|| AppError::BadRequest("Missing file field".into()))?;
+    let full_path = file_path.ok_or_else(|| AppError::BadRequest("Missing path field".into()))?;
+    let spool = spool.ok_or_else(|| AppError::BadRequest("Missing file field".into()))?;
 
-    let full_path = resolve_path(&state.config.workspace, &path);
+    move_into_place(spool.path.clone(), full_path.clone(), true).await?;
+    spool.keep();
 
-    if let Some(parent) = full_path.parent() {
-        fs::create_dir_all(parent)
-            .await
-            .map_err(|e| AppError::Internal(e.to_string()))?;
-    }
-
-    fs::write(&full_path, &data)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+    Ok((full_path, size))
+}
 
-    Ok(Json(FileWriteResponse {
-        path: full_path.to_string_lossy().into_owned(),
-        size: data.len() as u64,
-    }))
+/// Move a spooled upload to its destination, creating parent directories.
+/// A symlinked destination is followed so the link's target is replaced, not
+/// the link. With `keep_mode` an existing destination keeps its permissions,
+/// so a re-uploaded script stays executable. Falls back to copy + remove when
+/// the spool is on another filesystem.
+async fn move_into_place(tmp_path: PathBuf, dest: PathBuf, keep_mode: bool) -> Result<()> {
+    run_blocking(move || {
+        // canonicalize fails while nothing exists there; use the path as given
+        let dest = std::fs::canonicalize(&dest).unwrap_or(dest);
+        if keep_mode {
+            if let Ok(existing) = std::fs::metadata(&dest) {
+                std::fs::set_permissions(&tmp_path, existing.permissions())?;
+            }
+        }
+        if let Some(parent) = dest.parent() {
+            std::fs::create_dir_all(parent)?;
+        }
+        if std::fs::rename(&tmp_path, &dest).is_err() {
+            std::fs::copy(&tmp_path, &dest)?;
+            std::fs::remove_file(&tmp_path)?;
+        }
+        Ok(())
+    })
+    .await
 }
 
 // Download file
@@ -289,23 +639,16 @@ pub struct FileDownloadQuery {
 
 pub async fn download_file(
     State(state): State<Arc<AppState>>,
+    headers: HeaderMap,
     Query(query): Query<FileDownloadQuery>,
 ) -> Result<Response> {
     let full_path = resolve_path(&state.config.workspace, &query.path);
 
-    if !full_path.exists() {
-        return Err(AppError::NotFound("File not found".into()));
+    let (body, size, etag) = stream_file(&full_path).await?;
+    if etag_matches(&headers, &etag) {
+        return Ok(not_modified(&etag));
     }
 
-    let mut file = fs::File::open(&full_path)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
-
-    let mut contents = Vec::new();
-    file.read_to_end(&mut contents)
-        .await
-        .map_err(|e| AppError::Internal(e.to_string()))?;
-
     let filename = full_path
         .file_name()
         .map(|n| n.to_string_lossy().into_owned())
@@ -315,12 +658,83 @@ pub async fn download_file(
         StatusCode::OK,
         [
             (header::CONTENT_TYPE, "application/octet-stream"),
+            (header::CONTENT_LENGTH, &size.to_string()),
+            (header::ETAG, &etag),
+            (header::CACHE_CONTROL, REVALIDATE),
             (
                 header::CONTENT_DISPOSITION,
                 &format!("attachment; filename=\"{}\"", filename),
             ),
         ],
-        contents,
+        body,
     )
         .into_response())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use chrono::TimeZone;
+
+    #[test]
+    fn test_serialize_rfc3339_matches_to_rfc3339() {
+        for nanos in [0, 123_000_000, 123_456_789] {
+            let time = chrono::Utc.timestamp_opt(1_700_000_000, nanos).unwrap();
+            let mut out = Vec::new();
+            serialize_rfc3339(&time, &mut serde_json::Serializer::new(&mut out)).unwrap();
+            assert_eq!(out, format!("\"{}\"", time.to_rfc3339()).into_bytes());
+        }
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn test_file_etag_changes_when_replaced() {
+        let dir = tempfile::tempdir().unwrap();
+        let mtime = UNIX_EPOCH + std::time::Duration::from_secs(1_700_000_000);
+        let etag_of = |name: &str| {
+            let file = std::fs::File::create(dir.path().join(name)).unwrap();
+            file.set_modified(mtime).unwrap();
+            file_etag(&file.metadata().unwrap())
+        };
+
+        // Same size and mtime, different inode
+        assert_ne!(etag_of("a"), etag_of("b"));
+    }
+
+    #[test]
+    fn test_collect_entries_skips_spools() {
+        let dir = tempfile::tempdir().unwrap();
+        std::fs::write(dir.path().join("a.txt"), "a").unwrap();
+        let spool = Spool::new(dir.path());
+        std::fs::write(&spool.path, "partial").unwrap();
+
+        let mut entries = Vec::new();
+        let read_dir = std::fs::read_dir(dir.path()).unwrap();
+        assert!(collect_entries(read_dir, false, usize::MAX, &mut entries).unwrap());
+        assert_eq!(entries.len(), 1);
+        assert_eq!(entries[0].name, "a.txt");
+    }
+
+    #[cfg(unix)]
+    #[tokio::test]
+    async fn test_move_into_place_keeps_mode_through_symlink() {
+        use std::os::unix::fs::PermissionsExt;
+
+        let dir = tempfile::tempdir().unwrap();
+        let target = dir.path().join("run.sh");
+        std::fs::write(&target, "old").unwrap();
+        std::fs::set_permissions(&target, std::fs::Permissions::from_mode(0o755)).unwrap();
+        let link = dir.path().join("link.sh");
+        std::os::unix::fs::symlink(&target, &link).unwrap();
+
+        let spool = dir.path().join(".upload-test");
+        std::fs::write(&spool, "new").unwrap();
+        move_into_place(spool, link.clone(), true).await.unwrap();
+
+        let link_meta = std::fs::symlink_metadata(&link).unwrap();
+        assert!(link_meta.file_type().is_symlink());
+        assert_eq!(std::fs::read_to_string(&target).unwrap(), "new");
+        let mode = std::fs::metadata(&target).unwrap().permissions().mode();
+        assert_eq!(mode & 0o777, 0o755);
+    }
+}
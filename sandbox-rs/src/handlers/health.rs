@@ -1,7 +1,8 @@
 use crate::state::AppState;
 use axum::{extract::State, Json};
 use serde::Serialize;
-use std::sync::Arc;
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::{Duration, Instant};
 
 #[derive(Serialize)]
 pub struct HealthResponse {
@@ -16,8 +17,28 @@ pub struct Services {
     pub browser: bool,
 }
 
+/// How long a display check result is reused before stat'ing the socket again
+const DISPLAY_CHECK_TTL: Duration = Duration::from_secs(1);
+
+static DISPLAY_CHECK: Mutex<Option<(Instant, bool)>> = Mutex::new(None);
+
+/// Whether the X11 socket exists, re-checked at most once per
+/// `DISPLAY_CHECK_TTL` so frequent health probes don't each hit the filesystem
+fn display_exists() -> bool {
+    let mut cached = DISPLAY_CHECK.lock().unwrap_or_else(|e| e.into_inner());
+    let now = Instant::now();
+    match *cached {
+        Some((checked_at, exists)) if now.duration_since(checked_at) < DISPLAY_CHECK_TTL => exists,
+        _ => {
+            let exists = std::path::Path::new("/tmp/.X11-unix/X99").exists();
+            *cached = Some((now, exists));
+            exists
+        }
+    }
+}
+
 pub async fn health_check(State(state): State<Arc<AppState>>) -> Json<HealthResponse> {
-    let display_exists = std::path::Path::new("/tmp/.X11-unix/X99").exists();
+    let display_exists = display_exists();
 
     Json(HealthResponse {
         status: "healthy".into(),
@@ -38,16 +59,21 @@ pub struct SandboxInfo {
     pub vnc_url: String,
 }
 
-pub async fn sandbox_info(State(state): State<Arc<AppState>>) -> Json<SandboxInfo> {
-    let hostname = hostname::get()
-        .map(|h| h.to_string_lossy().into_owned())
-        .unwrap_or_else(|_| "unknown".into());
-
-    Json(SandboxInfo {
-        hostname,
-        workspace: state.config.workspace.clone(),
-        display: state.config.display.clone(),
-        cdp_url: format!("http://localhost:{}", state.config.cdp_port),
-        vnc_url: "vnc://localhost:5900".into(),
-    })
+/// Built on first request; none of these fields change while the server runs
+static SANDBOX_INFO: OnceLock<SandboxInfo> = OnceLock::new();
+
+pub async fn sandbox_info(State(state): State<Arc<AppState>>) -> Json<&'static SandboxInfo> {
+    Json(SANDBOX_INFO.get_or_init(|| {
+        let hostname = hostname::get()
+            .map(|h| h.to_string_lossy().into_owned())
+            .unwrap_or_else(|_| "unknown".into());
+
+        SandboxInfo {
+            hostname,
+            workspace: state.config.workspace.clone(),
+            display: state.config.display.clone(),
+            cdp_url: format!("http://localhost:{}", state.config.cdp_port),
+            vnc_url: "vnc://localhost:5900".into(),
+        }
+    }))
 }
@@ -26,6 +26,83 @@ fn default_timeout() -> u64 {
     30
 }
 
+/// Characters that only a shell can interpret (operators, quoting, expansion, globbing)
+const SHELL_METACHARACTERS: &[char] = &[
+    '|', '&', ';', '<', '>', '(', ')', '{', '}', '$', '`', '\\', '"', '\'', '*', '?', '[', ']',
+    '#', '~', '=', '!', '\n',
+];
+
+/// Builtins and keywords that behave differently (or do not exist) outside a
+/// shell. Includes builtins that shadow a same-named binary with different
+/// option handling, such as `echo -e`.
+const SHELL_BUILTINS: &[&str] = &[
+    ".", ":", "[", "alias", "bg", "break", "case", "cd", "command", "continue", "echo", "eval",
+    "exec", "exit", "export", "false", "fg", "for", "getopts", "hash", "if", "jobs", "kill",
+    "local", "printf", "pwd", "read", "readonly", "return", "set", "shift", "source", "test",
+    "time", "times", "trap", "true", "type", "ulimit", "umask", "unalias", "unset", "until",
+    "wait", "while",
+];
+
+/// Split a command into argv when it can be executed without `sh -c`
+fn direct_argv(command: &str) -> Option<Vec<&str>> {
+    if command.contains(SHELL_METACHARACTERS) {
+        return None;
+    }
+
+    let argv: Vec<&str> = command.split_whitespace().collect();
+    let program = *argv.first()?;
+    if SHELL_BUILTINS.contains(&program) {
+        return None;
+    }
+
+    Some(argv)
+}
+
+/// Build the process for a command, exec'ing it directly unless a shell is required
+fn build_command(
+    command: &str,
+    cwd: &str,
+    env: Option<&HashMap<String, String>>,
+    allow_direct: bool,
+) -> Command {
+    let mut cmd = match direct_argv(command).filter(|_| allow_direct) {
+        Some(argv) => {
+            let mut cmd = Command::new(argv[0]);
+            cmd.args(&argv[1..]);
+            cmd
+        }
+        None => {
+            let mut cmd = Command::new("sh");
+            cmd.arg("-c").arg(command);
+            cmd
+        }
+    };
+    cmd.current_dir(cwd);
+
+    // Merge environment
+    if let Some(env) = env {
+        cmd.envs(env);
+    }
+
+    cmd
+}
+
+/// Run a command to completion. If a direct exec cannot be spawned (not on
+/// PATH, no shebang, not executable), the command is retried under `sh -c`
+/// so it behaves, and reports errors, exactly as the shell would.
+async fn run_command(
+    command: &str,
+    cwd: &str,
+    env: Option<&HashMap<String, String>>,
+) -> std::io::Result<std::process::Output> {
+    match build_command(command, cwd, env, true).output().await {
+        Err(_) if direct_argv(command).is_some() => {
+            build_command(command, cwd, env, false).output().await
+        }
+        result => result,
+    }
+}
+
 #[derive(Debug, Serialize)]
 pub struct ShellExecResponse {
     pub stdout: String,
@@ -41,20 +118,11 @@ pub async fn exec_command(
     let start = Instant::now();
     let cwd = req.cwd.unwrap_or_else(|| state.config.workspace.clone());
 
-    let mut cmd = Command::new("sh");
-    cmd.arg("-c").arg(&req.command).current_dir(&cwd);
-
-    // Merge environment
-    if let Some(env) = req.env {
-        for (key, value) in env {
-            cmd.env(key, value);
-        }
-    }
+    let run = run_command(&req.command, &cwd, req.env.as_ref());
 
-    let output = timeout(Duration::from_secs(req.timeout), cmd.output())
+    let output = timeout(Duration::from_secs(req.timeout), run)
         .await
-        .map_err(|_| AppError::Timeout("Command timed out".into()))?
-        .map_err(|e| AppError::Internal(e.to_string()))?;
+        .map_err(|_| AppError::Timeout("Command timed out".into()))??;
 
     Ok(Json(ShellExecResponse {
         stdout: String::from_utf8_lossy(&output.stdout).into_owned(),
@@ -64,6 +132,16 @@ pub async fn exec_command(
     }))
 }
 
+/// Read buffer for /shell/stream, large enough that chatty commands are
+/// drained in a few reads rather than one per pipe-sized chunk
+const STREAM_BUFFER_SIZE: usize = 64 * 1024;
+
+/// Strip a trailing `\n` or `\r\n` from a line read with `read_until`
+fn trim_line_ending(line: &[u8]) -> &[u8] {
+    let line = line.strip_suffix(b"\n").unwrap_or(line);
+    line.strip_suffix(b"\r").unwrap_or(line)
+}
+
 pub async fn stream_command(
     State(state): State<Arc<AppState>>,
     Json(req): Json<ShellExecRequest>,
@@ -71,29 +149,37 @@ pub async fn stream_command(
     let cwd = req.cwd.unwrap_or_else(|| state.config.workspace.clone());
 
     let stream = async_stream::stream! {
-        let mut cmd = Command::new("sh");
-        cmd.arg("-c")
-            .arg(&req.command)
-            .current_dir(&cwd)
-            .stdout(std::process::Stdio::piped())
-            .stderr(std::process::Stdio::piped());
-
-        // Merge environment
-        if let Some(env) = &req.env {
-            for (key, value) in env {
-                cmd.env(key, value);
-            }
-        }
+        let spawn = |allow_direct| {
+            // stderr is not part of the stream; discard it rather than leave
+            // an unread pipe that blocks the child once it fills
+            build_command(&req.command, &cwd, req.env.as_ref(), allow_direct)
+                .stdout(std::process::Stdio::piped())
+                .stderr(std::process::Stdio::null())
+                .spawn()
+        };
+
+        // Any failure to exec directly is retried under the shell, as in run_command
+        let spawned = match spawn(true) {
+            Err(_) if direct_argv(&req.command).is_some() => spawn(false),
+            result => result,
+        };
 
-        match cmd.spawn() {
+        match spawned {
             Ok(mut child) => {
                 let stdout = child.stdout.take();
-                let _stderr = child.stderr.take();
 
                 if let Some(stdout) = stdout {
-                    let mut reader = BufReader::new(stdout).lines();
-                    while let Ok(Some(line)) = reader.next_line().await {
+                    // Split on raw bytes with one reused buffer; invalid UTF-8 is
+                    // replaced rather than ending the stream
+                    let mut reader = BufReader::with_capacity(STREAM_BUFFER_SIZE, stdout);
+                    let mut buf = Vec::new();
+                    while let Ok(n) = reader.read_until(b'\n', &mut buf).await {
+                        if n == 0 {
+                            break;
+                        }
+                        let line = String::from_utf8_lossy(trim_line_ending(&buf));
                         yield Ok(Event::default().data(line));
+                        buf.clear();
                     }
                 }
 
@@ -115,3 +201,87 @@ pub async fn stream_command(
 
     Sse::new(stream).keep_alive(KeepAlive::default())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_direct_argv_simple() {
+        assert_eq!(direct_argv("ls /tmp"), Some(vec!["ls", "/tmp"]));
+        assert_eq!(
+            direct_argv("  ls   -la /tmp "),
+            Some(vec!["ls", "-la", "/tmp"])
+        );
+    }
+
+    #[test]
+    fn test_trim_line_ending() {
+        assert_eq!(trim_line_ending(b"hello\n"), b"hello");
+        assert_eq!(trim_line_ending(b"hello\r\n"), b"hello");
+        assert_eq!(trim_line_ending(b"last"), b"last");
+        assert_eq!(trim_line_ending(b"\n"), b"");
+    }
+
+    #[test]
+    fn test_direct_argv_needs_shell() {
+        assert_eq!(direct_argv("echo $HOME"), None);
+        assert_eq!(direct_argv("echo error >&2"), None);
+        assert_eq!(direct_argv("ls | wc -l"), None);
+        assert_eq!(direct_argv("echo 'quoted arg'"), None);
+        assert_eq!(direct_argv("FOO=bar env"), None);
+        assert_eq!(direct_argv("exit 42"), None);
+        assert_eq!(direct_argv("cd /tmp"), None);
+        assert_eq!(direct_argv("   "), None);
+    }
+
+    #[test]
+    fn test_direct_argv_shell_builtins() {
+        assert_eq!(direct_argv("echo -e hi"), None);
+        assert_eq!(direct_argv("printf %s hi"), None);
+        assert_eq!(direct_argv("test -d /tmp"), None);
+        assert_eq!(direct_argv("time ls"), None);
+        assert_eq!(direct_argv("pwd"), None);
+        assert_eq!(direct_argv("kill -0 1"), None);
+    }
+
+    #[tokio::test]
+    async fn test_run_command_matches_shell_builtin() {
+        let shell = Command::new("sh")
+            .arg("-c")
+            .arg("echo -e hi")
+            .output()
+            .await
+            .unwrap();
+        let output = run_command("echo -e hi", "/tmp", None).await.unwrap();
+        assert_eq!(output.stdout, shell.stdout);
+    }
+
+    #[cfg(unix)]
+    #[tokio::test]
+    async fn test_run_command_script_without_shebang() {
+        use std::os::unix::fs::PermissionsExt;
+
+        let dir = tempfile::tempdir().unwrap();
+        let script = dir.path().join("noshebang.sh");
+        std::fs::write(&script, "echo ran\n").unwrap();
+        std::fs::set_permissions(&script, std::fs::Permissions::from_mode(0o755)).unwrap();
+
+        let cwd = dir.path().to_str().unwrap();
+        let output = run_command("./noshebang.sh", cwd, None).await.unwrap();
+        assert_eq!(output.status.code(), Some(0));
+        assert_eq!(output.stdout, b"ran\n");
+    }
+
+    #[cfg(unix)]
+    #[tokio::test]
+    async fn test_run_command_not_executable() {
+        let dir = tempfile::tempdir().unwrap();
+        std::fs::write(dir.path().join("plain.sh"), "echo ran\n").unwrap();
+
+        // The shell reports this as exit 126 rather than a spawn error
+        let cwd = dir.path().to_str().unwrap();
+        let output = run_command("./plain.sh", cwd, None).await.unwrap();
+        assert_eq!(output.status.code(), Some(126));
+    }
+}
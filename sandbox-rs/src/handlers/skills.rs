@@ -161,7 +161,7 @@ pub async fn execute_script(
     let scripts_dir = skill_dir.join("scripts");
     let script_path = scripts_dir.join(&script_name);
 
-    if !script_path.exists() {
+    if !tokio::fs::try_exists(&script_path).await.unwrap_or(false) {
         return Err(AppError::NotFound(format!(
             "Script file not found: {}",
             script_path.display()
@@ -9,7 +9,9 @@ mod state;
 mod tee;
 
 use axum::{
+    extract::DefaultBodyLimit,
     routing::{get, post},
+    serve::ListenerExt,
     Router,
 };
 use std::net::SocketAddr;
@@ -18,11 +20,11 @@ use tracing_subscriber::{layer::SubscriberExt, util::SubscriberInitExt};
 
 use config::Config;
 use handlers::{
-    browser_click, browser_evaluate, browser_goto, browser_screenshot, browser_status,
-    browser_type, check_trigger, continue_factory, create_skill, delete_skill, download_file,
-    exec_command, execute_code, execute_script, get_skill, health_check, list_files, list_skills,
-    read_file, sandbox_info, search_skills, start_factory, stream_command, update_skill,
-    upload_file, write_file,
+    browser_click, browser_evaluate, browser_goto, browser_screenshot, browser_screenshot_raw,
+    browser_status, browser_type, check_trigger, continue_factory, create_skill, delete_files,
+    delete_skill, download_file, exec_command, execute_code, execute_script, get_skill,
+    health_check, list_files, list_skills, read_file, sandbox_info, search_skills, start_factory,
+    stream_command, update_skill, upload_file, write_file, write_file_raw,
 };
 
 #[cfg(feature = "tee")]
@@ -45,6 +47,16 @@ async fn main() {
     let addr = SocketAddr::from(([0, 0, 0, 0], config.port));
     let state = AppState::new(config);
 
+    if state.config.browser_prelaunch {
+        let browser = state.browser.clone();
+        tokio::spawn(async move {
+            match browser.warm_up().await {
+                Ok(()) => tracing::info!("browser prelaunched"),
+                Err(e) => tracing::warn!("browser prelaunch failed: {}", e),
+            }
+        });
+    }
+
     let app = Router::new()
         // Health
         .route("/health", get(health_check))
@@ -57,8 +69,14 @@ async fn main() {
         // Files
         .route("/file/read", get(read_file))
         .route("/file/write", post(write_file))
+        .route("/file/write_raw", post(write_file_raw))
         .route("/file/list", get(list_files))
-        .route("/file/upload", post(upload_file))
+        .route("/file/delete", post(delete_files))
+        // Uploads are streamed to disk, so they are not held to the 2 MB default
+        .route(
+            "/file/upload",
+            post(upload_file).layer(DefaultBodyLimit::disable()),
+        )
         .route("/file/download", get(download_file))
         // Skills routes
         .route("/skills", get(list_skills).post(create_skill))
@@ -75,6 +93,7 @@ async fn main() {
         // Browser routes
         .route("/browser/goto", post(browser_goto))
         .route("/browser/screenshot", post(browser_screenshot))
+        .route("/browser/screenshot/raw", post(browser_screenshot_raw))
         .route("/browser/evaluate", post(browser_evaluate))
         .route("/browser/click", post(browser_click))
         .route("/browser/type", post(browser_type))
@@ -93,6 +112,14 @@ async fn main() {
 
     tracing::info!("listening on {}", addr);
 
-    let listener = tokio::net::TcpListener::bind(addr).await.unwrap();
+    // Disable Nagle so small JSON responses and SSE events go out immediately
+    let listener = tokio::net::TcpListener::bind(addr)
+        .await
+        .unwrap()
+        .tap_io(|tcp| {
+            if let Err(err) = tcp.set_nodelay(true) {
+                tracing::warn!("failed to set TCP_NODELAY: {}", err);
+            }
+        });
     axum::serve(listener, app).await.unwrap();
 }
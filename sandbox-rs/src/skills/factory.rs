@@ -262,28 +262,26 @@ impl Default for FactorySessions {
     }
 }
 
+/// Phrases that activate the factory skill
+const TRIGGER_PHRASES: [&str; 7] = [
+    "teach me",
+    "teach you",
+    "learn this",
+    "learn how",
+    "create a skill",
+    "remember how to",
+    "automate this",
+];
+
 /// Check if input contains trigger phrases for the factory skill
 pub fn check_triggers(input: &str) -> Vec<String> {
     let normalized = input.to_lowercase();
-    let mut triggers = Vec::new();
-
-    let trigger_phrases = [
-        "teach me",
-        "teach you",
-        "learn this",
-        "learn how",
-        "create a skill",
-        "remember how to",
-        "automate this",
-    ];
-
-    for phrase in &trigger_phrases {
-        if normalized.contains(phrase) {
-            triggers.push(phrase.to_string());
-        }
-    }
 
-    triggers
+    TRIGGER_PHRASES
+        .iter()
+        .filter(|phrase| normalized.contains(**phrase))
+        .map(|phrase| phrase.to_string())
+        .collect()
 }
 
 #[cfg(test)]
@@ -78,7 +78,7 @@ impl SkillRegistry {
 
         while let Some(entry) = entries.next_entry().await? {
             let path = entry.path();
-            if !path.is_dir() {
+            if !fs::metadata(&path).await.is_ok_and(|m| m.is_dir()) {
                 continue;
             }
 
@@ -87,12 +87,12 @@ impl SkillRegistry {
                 None => continue,
             };
 
-            // Try to read the skill to get its description
-            match self.get(&name).await {
-                Ok(skill) => {
+            // Only the frontmatter is needed for a summary
+            match self.get_meta(&name).await {
+                Ok(meta) => {
                     summaries.push(SkillSummary {
-                        name: skill.meta.name,
-                        description: skill.meta.description,
+                        name: meta.name,
+                        description: meta.description,
                     });
                 }
                 Err(_) => {
@@ -111,7 +111,7 @@ impl SkillRegistry {
         validate_skill_name(name).map_err(|e| AppError::BadRequest(e))?;
 
         let skill_md_path = self.skill_md_path(name);
-        if !skill_md_path.exists() {
+        if !fs::try_exists(&skill_md_path).await.unwrap_or(false) {
             return Err(AppError::NotFound(format!("Skill '{}' not found", name)));
         }
 
@@ -133,21 +133,48 @@ impl SkillRegistry {
         })
     }
 
+    /// Read only the metadata of a skill, without listing its resource directories
+    async fn get_meta(&self, name: &str) -> Result<SkillMeta> {
+        validate_skill_name(name).map_err(|e| AppError::BadRequest(e))?;
+
+        let content = fs::read_to_string(self.skill_md_path(name)).await?;
+        let (meta, _) = self.parse_skill_md(&content)?;
+
+        Ok(meta)
+    }
+
     /// Create a new skill
     pub async fn create(&self, req: CreateSkillRequest) -> Result<Skill> {
         validate_skill_name(&req.name).map_err(|e| AppError::BadRequest(e))?;
         validate_description(&req.description).map_err(|e| AppError::BadRequest(e))?;
 
+        let resources = [
+            ("scripts", &req.scripts),
+            ("references", &req.references),
+            ("assets", &req.assets),
+        ];
+
+        // Validate every filename up front so a bad request leaves nothing on disk
+        for (_, files) in resources {
+            for filename in files.keys() {
+                validate_filename(filename)?;
+            }
+        }
+
+        // Claim the skill directory with a single mkdir: an existing skill
+        // (or a concurrent create of the same name) fails with AlreadyExists
+        self.ensure_skills_dir().await?;
         let skill_dir = self.skill_path(&req.name);
-        if skill_dir.exists() {
-            return Err(AppError::BadRequest(format!("Skill '{}' already exists", req.name)));
+        match fs::create_dir(&skill_dir).await {
+            Err(e) if e.kind() == std::io::ErrorKind::AlreadyExists => {
+                return Err(AppError::BadRequest(format!("Skill '{}' already exists", req.name)));
+            }
+            result => result?,
         }
 
-        // Create skill directory structure
-        fs::create_dir_all(&skill_dir).await?;
-        fs::create_dir_all(skill_dir.join("scripts")).await?;
-        fs::create_dir_all(skill_dir.join("references")).await?;
-        fs::create_dir_all(skill_dir.join("assets")).await?;
+        for (subdir, _) in resources {
+            fs::create_dir(skill_dir.join(subdir)).await?;
+        }
 
         // Create metadata
         let meta = SkillMeta {
@@ -157,31 +184,22 @@ impl SkillRegistry {
             compatibility: None,
             metadata: None,
         };
-
-        // Write SKILL.md
         let skill_md = self.format_skill_md(&meta, &req.body);
-        fs::write(self.skill_md_path(&req.name), skill_md).await?;
 
-        // Write scripts
-        for (filename, content) in &req.scripts {
-            validate_filename(filename)?;
-            let script_path = skill_dir.join("scripts").join(filename);
-            fs::write(script_path, content).await?;
-        }
-
-        // Write references
-        for (filename, content) in &req.references {
-            validate_filename(filename)?;
-            let ref_path = skill_dir.join("references").join(filename);
-            fs::write(ref_path, content).await?;
-        }
-
-        // Write assets
-        for (filename, content) in &req.assets {
-            validate_filename(filename)?;
-            let asset_path = skill_dir.join("assets").join(filename);
-            fs::write(asset_path, content).await?;
+        // Write SKILL.md, scripts, references and assets as one batch
+        let mut writes: Vec<(PathBuf, &str)> =
+            vec![(self.skill_md_path(&req.name), skill_md.as_str())];
+        for (subdir, files) in resources {
+            for (filename, content) in files {
+                writes.push((skill_dir.join(subdir).join(filename), content.as_str()));
+            }
         }
+        futures::future::try_join_all(
+            writes
+                .iter()
+                .map(|(path, content)| fs::write(path, content)),
+        )
+        .await?;
 
         self.get(&req.name).await
     }
@@ -213,7 +231,7 @@ impl SkillRegistry {
         if let Some(scripts) = &req.scripts {
             let scripts_dir = skill_dir.join("scripts");
             // Remove old scripts
-            if scripts_dir.exists() {
+            if fs::try_exists(&scripts_dir).await.unwrap_or(false) {
                 fs::remove_dir_all(&scripts_dir).await?;
             }
             fs::create_dir_all(&scripts_dir).await?;
@@ -229,7 +247,7 @@ impl SkillRegistry {
         if let Some(references) = &req.references {
             let references_dir = skill_dir.join("references");
             // Remove old references
-            if references_dir.exists() {
+            if fs::try_exists(&references_dir).await.unwrap_or(false) {
                 fs::remove_dir_all(&references_dir).await?;
             }
             fs::create_dir_all(&references_dir).await?;
@@ -245,7 +263,7 @@ impl SkillRegistry {
         if let Some(assets) = &req.assets {
             let assets_dir = skill_dir.join("assets");
             // Remove old assets
-            if assets_dir.exists() {
+            if fs::try_exists(&assets_dir).await.unwrap_or(false) {
                 fs::remove_dir_all(&assets_dir).await?;
             }
             fs::create_dir_all(&assets_dir).await?;
@@ -265,7 +283,7 @@ impl SkillRegistry {
         validate_skill_name(name).map_err(|e| AppError::BadRequest(e))?;
 
         let skill_dir = self.skill_path(name);
-        if !skill_dir.exists() {
+        if !fs::try_exists(&skill_dir).await.unwrap_or(false) {
             return Err(AppError::NotFound(format!("Skill '{}' not found", name)));
         }
 
@@ -291,22 +309,26 @@ impl SkillRegistry {
 
     /// Parse SKILL.md into metadata and body
     fn parse_skill_md(&self, content: &str) -> Result<(SkillMeta, String)> {
-        // Split on --- to extract frontmatter
-        let parts: Vec<&str> = content.splitn(3, "---").collect();
-
-        if parts.len() < 3 {
-            return Err(AppError::BadRequest(
+        let missing_delimiters = || {
+            AppError::BadRequest(
                 "Invalid SKILL.md format: missing frontmatter delimiters".to_string(),
-            ));
-        }
+            )
+        };
 
-        // Parse YAML frontmatter (parts[1])
-        let frontmatter = parts[1].trim();
+        // Locate the frontmatter by index: opening --- then the next line starting with ---
+        let rest = content
+            .trim_start()
+            .strip_prefix("---")
+            .ok_or_else(missing_delimiters)?;
+        let end = rest.find("\n---").ok_or_else(missing_delimiters)?;
+
+        // Parse YAML frontmatter
+        let frontmatter = rest[..end].trim();
         let meta: SkillMeta = serde_yaml::from_str(frontmatter)
             .map_err(|e| AppError::BadRequest(format!("Failed to parse frontmatter: {}", e)))?;
 
-        // Body is everything after the second ---
-        let body = parts[2].trim().to_string();
+        // Body is everything after the closing ---
+        let body = rest[end + 4..].trim().to_string();
 
         Ok((meta, body))
     }
@@ -319,7 +341,7 @@ impl SkillRegistry {
 
     /// List files in a directory
     async fn list_dir_files(&self, dir: &PathBuf) -> Result<Vec<String>> {
-        if !dir.exists() {
+        if !fs::try_exists(dir).await.unwrap_or(false) {
             return Ok(Vec::new());
         }
 
@@ -328,7 +350,7 @@ impl SkillRegistry {
 
         while let Some(entry) = entries.next_entry().await? {
             let path = entry.path();
-            if path.is_file() {
+            if fs::metadata(&path).await.is_ok_and(|m| m.is_file()) {
                 if let Some(name) = path.file_name().and_then(|n| n.to_str()) {
                     files.push(name.to_string());
                 }
@@ -373,6 +395,24 @@ mod tests {
         assert_eq!(retrieved.meta.name, "test-skill");
     }
 
+    #[tokio::test]
+    async fn test_create_duplicate_skill() {
+        let (registry, _temp) = create_test_registry().await;
+
+        let req = CreateSkillRequest {
+            name: "dup-skill".to_string(),
+            description: "A test skill".to_string(),
+            body: "Body".to_string(),
+            scripts: HashMap::new(),
+            references: HashMap::new(),
+            assets: HashMap::new(),
+        };
+
+        registry.create(req.clone()).await.unwrap();
+        let result = registry.create(req).await;
+        assert!(matches!(result, Err(AppError::BadRequest(_))));
+    }
+
     #[tokio::test]
     async fn test_list_skills() {
         let (registry, _temp) = create_test_registry().await;
@@ -501,4 +541,20 @@ with multiple lines
         assert_eq!(meta.description, "A test skill");
         assert!(body.contains("This is the body content"));
     }
+
+    #[tokio::test]
+    async fn test_parse_skill_md_delimiters() {
+        let (registry, _temp) = create_test_registry().await;
+
+        // A horizontal rule in the body must not end the frontmatter early
+        let content =
+            "---\nname: test-skill\ndescription: A test skill\n---\n\nIntro\n\n---\n\nMore";
+        let (meta, body) = registry.parse_skill_md(content).unwrap();
+        assert_eq!(meta.name, "test-skill");
+        assert_eq!(body, "Intro\n\n---\n\nMore");
+
+        // Missing closing delimiter
+        let content = "---\nname: test-skill\ndescription: A test skill\n";
+        assert!(registry.parse_skill_md(content).is_err());
+    }
 }
@@ -30,6 +30,7 @@ impl AppState {
             viewport_width: config.browser_viewport_width,
             viewport_height: config.browser_viewport_height,
             timeout: config.browser_timeout,
+            max_pages: config.browser_max_pages,
         };
 
         #[cfg(feature = "tee")]
@@ -3,8 +3,7 @@ use serde_json::{json, Value};
 use std::time::Duration;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -19,15 +18,25 @@ async fn wait_for_server(base_url: &str) {
     panic!("Server did not start in time");
 }
 
+/// Width and height from a PNG's IHDR chunk, without decoding the image
+fn png_dimensions(data: &[u8]) -> (u32, u32) {
+    assert!(
+        data.starts_with(b"\x89PNG\r\n\x1a\n"),
+        "Expected PNG signature"
+    );
+    let width = u32::from_be_bytes(data[16..20].try_into().unwrap());
+    let height = u32::from_be_bytes(data[20..24].try_into().unwrap());
+    (width, height)
+}
+
 #[tokio::test]
 #[ignore] // Requires running server with Chromium
 async fn test_browser_status_before_use() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .get(format!("{}/browser/status", base_url))
         .send()
@@ -46,9 +55,8 @@ async fn test_browser_goto() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/goto", base_url))
         .json(&json!({
@@ -70,13 +78,63 @@ async fn test_browser_goto() {
 
 #[tokio::test]
 #[ignore] // Requires running server with Chromium
-async fn test_browser_screenshot() {
+async fn test_browser_goto_wait_for() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let resp = client
+        .post(format!("{}/browser/goto", base_url))
+        .json(&json!({
+            "url": "https://example.com",
+            "wait_for": "h1"
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+
+    // A selector that never appears times out instead of hanging
+    let resp = client
+        .post(format!("{}/browser/goto", base_url))
+        .json(&json!({
+            "url": "https://example.com",
+            "wait_for": "#does-not-exist",
+            "timeout": 1
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 408);
+
+    // An invalid selector fails fast rather than polling until the deadline
+    let start = std::time::Instant::now();
+    let resp = client
+        .post(format!("{}/browser/goto", base_url))
+        .json(&json!({
+            "url": "https://example.com",
+            "wait_for": "h1[",
+            "timeout": 5
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 400);
+    assert!(start.elapsed() < Duration::from_secs(5));
+}
+
+#[tokio::test]
+#[ignore] // Requires running server with Chromium
+async fn test_browser_screenshot() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/screenshot", base_url))
         .json(&json!({
@@ -101,13 +159,63 @@ async fn test_browser_screenshot() {
 
 #[tokio::test]
 #[ignore] // Requires running server with Chromium
-async fn test_browser_evaluate() {
+async fn test_browser_screenshot_raw() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let resp = client
+        .post(format!("{}/browser/screenshot/raw", base_url))
+        .json(&json!({
+            "url": "https://example.com"
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    assert_eq!(resp.headers()["content-type"], "image/png");
+
+    let bytes = resp.bytes().await.expect("Failed to read body");
+    let (width, height) = png_dimensions(&bytes);
+    assert!(width > 0 && height > 0);
+}
+
+#[tokio::test]
+#[ignore] // Requires running server with Chromium
+async fn test_browser_screenshot_raw_jpeg() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let resp = client
+        .post(format!("{}/browser/screenshot/raw", base_url))
+        .json(&json!({
+            "url": "https://example.com",
+            "format": "jpeg",
+            "quality": 60
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    assert_eq!(resp.headers()["content-type"], "image/jpeg");
+
+    let bytes = resp.bytes().await.expect("Failed to read body");
+    assert!(bytes.starts_with(&[0xFF, 0xD8]), "Expected JPEG SOI marker");
+}
+
+#[tokio::test]
+#[ignore] // Requires running server with Chromium
+async fn test_browser_evaluate() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/evaluate", base_url))
         .json(&json!({
@@ -132,9 +240,8 @@ async fn test_browser_evaluate_math() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/evaluate", base_url))
         .json(&json!({
@@ -157,9 +264,8 @@ async fn test_browser_click_nonexistent() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/click", base_url))
         .json(&json!({
@@ -180,9 +286,8 @@ async fn test_browser_click_existing() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     // example.com has an <a> link we can click
     let resp = client
         .post(format!("{}/browser/click", base_url))
@@ -203,9 +308,8 @@ async fn test_browser_type_nonexistent() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/type", base_url))
         .json(&json!({
@@ -227,9 +331,8 @@ async fn test_browser_status_after_use() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // First trigger browser launch with a goto
     client
@@ -262,9 +365,8 @@ async fn test_browser_goto_invalid_url() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/browser/goto", base_url))
         .json(&json!({
@@ -3,8 +3,7 @@ use serde_json::{json, Value};
 use std::time::Duration;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -24,9 +23,8 @@ async fn test_code_python() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/code/execute", base_url))
         .json(&json!({
@@ -49,9 +47,8 @@ async fn test_code_bash() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/code/execute", base_url))
         .json(&json!({
@@ -73,9 +70,8 @@ async fn test_code_unsupported_language() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/code/execute", base_url))
         .json(&json!({
@@ -88,3 +84,33 @@ async fn test_code_unsupported_language() {
 
     assert_eq!(resp.status(), 400);
 }
+
+#[tokio::test]
+async fn test_code_python_script_traceback() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let resp = client
+        .post(format!("{}/code/execute", base_url))
+        .json(&json!({
+            "code": "import sys\nprint(sys.argv[0] == __file__)\nraise ValueError('boom')",
+            "language": "python"
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    // Code runs from a script file, so __file__ is set and the traceback
+    // points into the snippet
+    assert_eq!(body["output"].as_str().unwrap().trim(), "True");
+    assert_eq!(body["exit_code"], 1);
+    let error = body["error"].as_str().unwrap();
+    assert!(error.contains("Traceback"));
+    assert!(error.contains(".py\", line 3"));
+    assert!(error.contains("ValueError: boom"));
+}
@@ -4,8 +4,7 @@ use std::time::Duration;
 use tempfile::TempDir;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -32,9 +31,8 @@ async fn test_factory_full_flow() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Step 1: Start factory session with initial goal
     let start_resp = client
@@ -157,9 +155,8 @@ async fn test_factory_session_not_found() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Try to continue with a non-existent session ID
     let resp = client
@@ -181,9 +178,8 @@ async fn test_check_trigger_phrases() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Test input that should trigger
     let resp = client
@@ -256,9 +252,8 @@ async fn test_factory_start_without_initial_input() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Start factory session without initial input
     let start_resp = client
@@ -299,9 +294,8 @@ async fn test_factory_rejection_and_restart() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Start and go through steps
     let start_resp = client
@@ -1,10 +1,10 @@
+use reqwest::multipart::{Form, Part};
 use reqwest::Client;
 use serde_json::{json, Value};
 use std::time::Duration;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -19,20 +19,37 @@ async fn wait_for_server(base_url: &str) {
     panic!("Server did not start in time");
 }
 
+/// A fresh path under /tmp, so tests and concurrent runs of the suite never
+/// share files
+fn unique_path(name: &str) -> String {
+    format!("/tmp/{}_{}", uuid::Uuid::new_v4().simple(), name)
+}
+
+/// Remove the paths a test created, in a single request
+async fn delete_paths(client: &Client, base_url: &str, paths: &[&str]) {
+    let resp = client
+        .post(format!("{}/file/delete", base_url))
+        .json(&json!({ "paths": paths }))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 200);
+}
+
 #[tokio::test]
 async fn test_file_write_and_read() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_file.txt");
 
     // Write file
     let write_resp = client
         .post(format!("{}/file/write", base_url))
         .json(&json!({
-            "path": "/tmp/test_file.txt",
+            "path": path,
             "content": "hello world"
         }))
         .send()
@@ -43,7 +60,7 @@ async fn test_file_write_and_read() {
 
     // Read file back
     let read_resp = client
-        .get(format!("{}/file/read?path=/tmp/test_file.txt", base_url))
+        .get(format!("{}/file/read?path={}", base_url, path))
         .send()
         .await
         .expect("Failed to send request");
@@ -52,16 +69,260 @@ async fn test_file_write_and_read() {
 
     let body: Value = read_resp.json().await.expect("Failed to parse JSON");
     assert_eq!(body["content"], "hello world");
+
+    delete_paths(&client, &base_url, &[&path]).await;
 }
 
 #[tokio::test]
-async fn test_file_list() {
+async fn test_file_read_binary() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_binary_read.txt");
+
+    client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": "raw \"bytes\"\n"
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+
+    let resp = client
+        .get(format!(
+            "{}/file/read?path={}&encoding=binary",
+            base_url, path
+        ))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    assert_eq!(resp.headers()["content-type"], "application/octet-stream");
+
+    let bytes = resp.bytes().await.expect("Failed to get body");
+    assert_eq!(&bytes[..], b"raw \"bytes\"\n");
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_read_binary_streamed() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_large_read.txt");
+
+    let content = "x".repeat(100_000);
+    client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": content
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+
+    let mut resp = client
+        .get(format!(
+            "{}/file/read?path={}&encoding=binary",
+            base_url, path
+        ))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+
+    // Count the body chunk by chunk instead of buffering it whole
+    let mut total = 0;
+    while let Some(chunk) = resp.chunk().await.expect("Failed to read chunk") {
+        assert!(chunk.iter().all(|&b| b == b'x'));
+        total += chunk.len();
+    }
+    assert_eq!(total, content.len());
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_write_raw() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_write_raw.bin");
+
+    let content = vec![b'X'; 100_000];
+    let resp = client
+        .post(format!("{}/file/write_raw?path={}", base_url, path))
+        .header("content-type", "application/octet-stream")
+        .body(content.clone())
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["size"], 100_000);
+
+    let mut resp = client
+        .get(format!(
+            "{}/file/read?path={}&encoding=binary",
+            base_url, path
+        ))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.headers()["content-length"], "100000");
+
+    // Compare as the body arrives rather than buffering a second copy
+    let mut offset = 0;
+    while let Some(chunk) = resp.chunk().await.expect("Failed to read chunk") {
+        assert_eq!(&chunk[..], &content[offset..offset + chunk.len()]);
+        offset += chunk.len();
+    }
+    assert_eq!(offset, content.len());
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_write_raw_keeps_mode() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("run_raw.sh");
+
+    let resp = client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": "#!/bin/sh\necho old\n",
+            "mode": "755"
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+    assert_eq!(resp.status(), 200);
+
+    // No mode given, so the existing file stays executable
+    let resp = client
+        .post(format!("{}/file/write_raw?path={}", base_url, path))
+        .body("#!/bin/sh\necho new\n")
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 200);
+
+    let resp = client
+        .post(format!("{}/shell/exec", base_url))
+        .json(&json!({ "command": path }))
+        .send()
+        .await
+        .expect("Failed to send request");
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["exit_code"], 0);
+    assert_eq!(body["stdout"], "new\n");
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_read_raw() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_raw_read.txt");
+
+    client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": "plain text"
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+
+    let resp = client
+        .get(format!("{}/file/read?path={}&raw=true", base_url, path))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    assert_eq!(resp.headers()["x-file-size"], "10");
+    assert!(resp.headers()["content-type"]
+        .to_str()
+        .unwrap()
+        .starts_with("text/plain"));
+
+    let content = resp.text().await.expect("Failed to get body");
+    assert_eq!(content, "plain text");
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_read_not_modified() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("test_etag.txt");
+
+    client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": "cached"
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+
+    let url = format!("{}/file/read?path={}", base_url, path);
+    let resp = client
+        .get(&url)
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 200);
+    let etag = resp.headers()["etag"].clone();
+
+    let resp = client
+        .get(&url)
+        .header("If-None-Match", etag)
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 304);
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_list() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Ensure /tmp exists and list it
     let resp = client
@@ -77,13 +338,100 @@ async fn test_file_list() {
 }
 
 #[tokio::test]
-async fn test_file_not_found() {
+async fn test_file_list_limit() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let dir = unique_path("list_limit_test");
+
+    // The writes are independent, so issue them together
+    let writes = ["a.txt", "b.txt", "c.txt"].map(|name| {
+        client
+            .post(format!("{}/file/write", base_url))
+            .json(&json!({
+                "path": format!("{}/{}", dir, name),
+                "content": name
+            }))
+            .send()
+    });
+    for resp in futures::future::join_all(writes).await {
+        assert_eq!(resp.expect("Failed to write file").status(), 200);
+    }
+
+    let resp = client
+        .get(format!("{}/file/list?path={}&limit=2", base_url, dir))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["entries"].as_array().unwrap().len(), 2);
+    assert_eq!(body["truncated"], true);
+
+    // Without a limit the listing is complete
+    let resp = client
+        .get(format!("{}/file/list?path={}", base_url, dir))
+        .send()
+        .await
+        .expect("Failed to send request");
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["entries"].as_array().unwrap().len(), 3);
+    assert_eq!(body["truncated"], false);
+
+    delete_paths(&client, &base_url, &[&dir]).await;
+}
+
+#[tokio::test]
+async fn test_file_delete() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    let dir = unique_path("delete_test");
+    let file = unique_path("delete_test_file.txt");
+    for path in [format!("{}/a.txt", dir), file.clone()] {
+        client
+            .post(format!("{}/file/write", base_url))
+            .json(&json!({ "path": path, "content": "bye" }))
+            .send()
+            .await
+            .expect("Failed to write file");
+    }
+
+    let resp = client
+        .post(format!("{}/file/delete", base_url))
+        .json(&json!({
+            "paths": [dir, file, unique_path("delete_test_missing")]
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["deleted"], 2);
+
+    let resp = client
+        .get(format!("{}/file/read?path={}", base_url, file))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 404);
+}
+
+#[tokio::test]
+async fn test_file_not_found() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .get(format!("{}/file/read?path=/nonexistent/file.txt", base_url))
         .send()
@@ -93,20 +441,180 @@ async fn test_file_not_found() {
     assert_eq!(resp.status(), 404);
 }
 
+/// Multipart upload form with the `path` and `file` parts in the given order
+fn upload_form(path: Option<&str>, content: Vec<u8>, path_first: bool) -> Form {
+    let file = Part::bytes(content).file_name("upload.bin");
+    match (path, path_first) {
+        (Some(path), true) => Form::new()
+            .text("path", path.to_string())
+            .part("file", file),
+        (Some(path), false) => Form::new()
+            .part("file", file)
+            .text("path", path.to_string()),
+        (None, _) => Form::new().part("file", file),
+    }
+}
+
+/// Upload `content` and check it reads back byte for byte
+async fn assert_upload_round_trip(client: &Client, base_url: &str, path_first: bool, len: usize) {
+    let path = unique_path("upload_test.bin");
+    let content: Vec<u8> = (0..len).map(|i| (i % 251) as u8).collect();
+
+    let resp = client
+        .post(format!("{}/file/upload", base_url))
+        .multipart(upload_form(Some(&path), content.clone(), path_first))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["size"], len);
+
+    let resp = client
+        .get(format!("{}/file/download?path={}", base_url, path))
+        .send()
+        .await
+        .expect("Failed to send request");
+    let bytes = resp.bytes().await.expect("Failed to get body");
+    assert!(bytes[..] == content[..], "Uploaded content does not match");
+
+    delete_paths(client, base_url, &[&path]).await;
+}
+
 #[tokio::test]
-async fn test_file_download() {
+async fn test_file_upload_path_first() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    assert_upload_round_trip(&client, &base_url, true, 1024).await;
+}
+
+#[tokio::test]
+async fn test_file_upload_file_first() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    assert_upload_round_trip(&client, &base_url, false, 1024).await;
+}
+
+#[tokio::test]
+async fn test_file_upload_large() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    // Over axum's 2 MB default body limit, which the upload route disables
+    assert_upload_round_trip(&client, &base_url, true, 3 * 1024 * 1024).await;
+}
+
+#[tokio::test]
+async fn test_file_upload_missing_path() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    let resp = client
+        .post(format!("{}/file/upload", base_url))
+        .multipart(upload_form(None, b"orphan".to_vec(), false))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 400);
+}
+
+#[tokio::test]
+async fn test_file_upload_keeps_mode() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("run.sh");
+
+    let resp = client
+        .post(format!("{}/file/write", base_url))
+        .json(&json!({
+            "path": path,
+            "content": "#!/bin/sh\necho old\n",
+            "mode": "755"
+        }))
+        .send()
+        .await
+        .expect("Failed to write file");
+    assert_eq!(resp.status(), 200);
+
+    // Re-uploading over an executable must not reset its mode
+    let resp = client
+        .post(format!("{}/file/upload", base_url))
+        .multipart(upload_form(
+            Some(&path),
+            b"#!/bin/sh\necho new\n".to_vec(),
+            true,
+        ))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 200);
+
+    let resp = client
+        .post(format!("{}/shell/exec", base_url))
+        .json(&json!({ "command": path }))
+        .send()
+        .await
+        .expect("Failed to send request");
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["exit_code"], 0);
+    assert_eq!(body["stdout"], "new\n");
+
+    delete_paths(&client, &base_url, &[&path]).await;
+}
+
+#[tokio::test]
+async fn test_file_download_directory() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    let resp = client
+        .get(format!("{}/file/download?path=/tmp", base_url))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 400);
+
+    let resp = client
+        .get(format!("{}/file/read?path=/tmp&encoding=binary", base_url))
+        .send()
+        .await
+        .expect("Failed to send request");
+    assert_eq!(resp.status(), 400);
+}
+
+#[tokio::test]
+async fn test_file_download() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+    let path = unique_path("download_test.txt");
 
     // First write a file
     client
         .post(format!("{}/file/write", base_url))
         .json(&json!({
-            "path": "/tmp/download_test.txt",
+            "path": path,
             "content": "download content"
         }))
         .send()
@@ -115,17 +623,17 @@ async fn test_file_download() {
 
     // Download it
     let resp = client
-        .get(format!(
-            "{}/file/download?path=/tmp/download_test.txt",
-            base_url
-        ))
+        .get(format!("{}/file/download?path={}", base_url, path))
         .send()
         .await
         .expect("Failed to send request");
 
     assert_eq!(resp.status(), 200);
     assert!(resp.headers().get("content-disposition").is_some());
+    assert_eq!(resp.headers()["content-length"], "16");
 
     let content = resp.text().await.expect("Failed to get body");
     assert_eq!(content, "download content");
+
+    delete_paths(&client, &base_url, &[&path]).await;
 }
@@ -3,8 +3,7 @@ use serde_json::Value;
 use std::time::Duration;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -24,9 +23,8 @@ async fn test_health_check() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .get(format!("{}/health", base_url))
         .send()
@@ -45,9 +43,8 @@ async fn test_sandbox_info() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .get(format!("{}/sandbox/info", base_url))
         .send()
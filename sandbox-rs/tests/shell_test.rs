@@ -3,8 +3,7 @@ use serde_json::{json, Value};
 use std::time::Duration;
 use tokio::time::sleep;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -24,9 +23,8 @@ async fn test_shell_exec_simple() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/shell/exec", base_url))
         .json(&json!({
@@ -48,9 +46,8 @@ async fn test_shell_exec_with_env() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/shell/exec", base_url))
         .json(&json!({
@@ -72,9 +69,8 @@ async fn test_shell_exec_stderr() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/shell/exec", base_url))
         .json(&json!({
@@ -95,9 +91,8 @@ async fn test_shell_exec_nonzero_exit() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .post(format!("{}/shell/exec", base_url))
         .json(&json!({
@@ -112,3 +107,82 @@ async fn test_shell_exec_nonzero_exit() {
     let body: Value = resp.json().await.expect("Failed to parse JSON");
     assert_eq!(body["exit_code"], 42);
 }
+
+#[tokio::test]
+async fn test_shell_exec_batched() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    // Ten commands in one request rather than ten round trips
+    let resp = client
+        .post(format!("{}/shell/exec", base_url))
+        .json(&json!({
+            "command": "for i in $(seq 0 9); do echo $i; done"
+        }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.status(), 200);
+
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    let lines: Vec<&str> = body["stdout"].as_str().unwrap().lines().collect();
+    let expected: Vec<String> = (0..10).map(|i| i.to_string()).collect();
+    assert_eq!(lines, expected);
+}
+
+#[tokio::test]
+async fn test_shell_exec_concurrent() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    let client = Client::new();
+    wait_for_server(&client, &base_url).await;
+
+    let requests = (0..50).map(|i| {
+        client
+            .post(format!("{}/shell/exec", base_url))
+            .json(&json!({ "command": format!("echo {}", i) }))
+            .send()
+    });
+    let responses = futures::future::join_all(requests).await;
+
+    for (i, resp) in responses.into_iter().enumerate() {
+        let resp = resp.expect("Failed to send request");
+        assert_eq!(resp.status(), 200);
+
+        let body: Value = resp.json().await.expect("Failed to parse JSON");
+        assert_eq!(body["stdout"].as_str().unwrap().trim(), i.to_string());
+    }
+}
+
+#[tokio::test]
+#[ignore] // Requires direct access to the server; proxies may not speak h2c
+async fn test_shell_exec_h2c() {
+    let base_url =
+        std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
+
+    // The server speaks cleartext HTTP/2, so requests can share one
+    // multiplexed connection instead of queueing for pooled sockets
+    let client = Client::builder()
+        .http2_prior_knowledge()
+        .build()
+        .expect("Failed to build client");
+    wait_for_server(&client, &base_url).await;
+
+    let resp = client
+        .post(format!("{}/shell/exec", base_url))
+        .json(&json!({ "command": "echo h2c" }))
+        .send()
+        .await
+        .expect("Failed to send request");
+
+    assert_eq!(resp.version(), reqwest::Version::HTTP_2);
+    assert_eq!(resp.status(), 200);
+
+    let body: Value = resp.json().await.expect("Failed to parse JSON");
+    assert_eq!(body["stdout"].as_str().unwrap().trim(), "h2c");
+}
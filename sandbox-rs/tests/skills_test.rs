@@ -5,8 +5,7 @@ use tempfile::TempDir;
 use tokio::time::sleep;
 use uuid::Uuid;
 
-async fn wait_for_server(base_url: &str) {
-    let client = Client::new();
+async fn wait_for_server(client: &Client, base_url: &str) {
     for _ in 0..50 {
         if client
             .get(format!("{}/health", base_url))
@@ -33,9 +32,8 @@ async fn test_list_skills_empty() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let resp = client
         .get(format!("{}/skills", base_url))
         .send()
@@ -55,9 +53,8 @@ async fn test_create_and_get_skill() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let skill_name = format!("test-skill-{}", Uuid::new_v4());
 
     // Create a skill
@@ -99,9 +96,8 @@ async fn test_create_skill_invalid_name() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Try to create a skill with invalid name (uppercase)
     let resp = client
@@ -152,9 +148,8 @@ async fn test_update_skill() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let skill_name = format!("update-test-{}", Uuid::new_v4());
 
     // Create a skill first
@@ -204,9 +199,8 @@ async fn test_delete_skill() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
     let skill_name = format!("delete-test-{}", Uuid::new_v4());
 
     // Create a skill first
@@ -256,9 +250,8 @@ async fn test_search_skills() {
     let base_url =
         std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-    wait_for_server(&base_url).await;
-
     let client = Client::new();
+    wait_for_server(&client, &base_url).await;
 
     // Use unique identifiers for skill names
     let uuid_suffix = Uuid::new_v4();
@@ -18,8 +18,7 @@ mod tee_tests {
     use std::time::Duration;
     use tokio::time::sleep;
 
-    async fn wait_for_server(base_url: &str) {
-        let client = Client::new();
+    async fn wait_for_server(client: &Client, base_url: &str) {
         for _ in 0..50 {
             if client
                 .get(format!("{}/health", base_url))
@@ -40,9 +39,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
         let resp = client
             .get(format!("{}/tee/info", base_url))
             .send()
@@ -67,9 +65,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Generate a quote with report data (64 bytes of zeros as hex)
         let report_data = "0".repeat(128); // 64 bytes in hex
@@ -100,9 +97,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Try to generate quote with invalid hex data
         let resp = client
@@ -124,9 +120,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Derive a key with path and purpose
         let resp = client
@@ -156,9 +151,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Derive a key without path or purpose (both optional)
         let resp = client
@@ -180,9 +174,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // First derive a key to sign with
         let _derive_resp = client
@@ -225,9 +218,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Try to sign with invalid hex data
         let resp = client
@@ -250,9 +242,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // This test would ideally:
         // 1. Derive a key
@@ -287,9 +278,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Try to verify with invalid hex data
         let resp = client
@@ -314,9 +304,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // Emit a runtime event
         let resp = client
@@ -348,9 +337,8 @@ mod tee_tests {
         let base_url =
             std::env::var("TEST_BASE_URL").unwrap_or_else(|_| "http://localhost:8080".into());
 
-        wait_for_server(&base_url).await;
-
         let client = Client::new();
+        wait_for_server(&client, &base_url).await;
 
         // 1. Derive a key
         let key_resp = client